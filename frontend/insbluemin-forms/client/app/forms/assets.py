@@ -0,0 +1,172 @@
+"""
+Fingerprinted, precompressed static assets for the Forms blueprint.
+
+``python -m app.forms.assets`` (from the client directory) copies the files
+under ``static/dist`` to ``static/build`` with a content hash in the name of
+every JS/CSS file, writes ``.gz`` (and ``.br`` when brotli is installed)
+variants next to them and records the mapping in ``static/build/manifest.json``.
+Templates resolve assets through ``forms_asset(name)``; without a manifest
+the original, unhashed file is used. gunicorn.conf.py runs ``build_if_stale``
+when the server starts, so deployments always serve built assets.
+"""
+# Standard library imports
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+# Third-party imports
+from flask import request, send_from_directory, url_for
+
+from .encoding import brotli, choose_encoding, compress
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+SOURCE_DIR = 'dist'
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.json'
+
+# Files that get a content hash in their name (referenced only through the manifest)
+HASHED_EXTENSIONS = ('.js', '.css')
+
+# Files worth precompressing
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.svg', '.json', '.txt', '.map')
+
+# Fingerprinted files never change, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_manifest = None
+
+
+def _skip(name, names):
+    """Skip editor junk and unminified bundles that have a minified sibling."""
+    if name.startswith('.'):
+        return True
+    root, ext = os.path.splitext(name)
+    return ext in HASHED_EXTENSIONS and not root.endswith('.min') and f"{root}.min{ext}" in names
+
+
+def build(static_dir=STATIC_DIR):
+    """
+    Build fingerprinted and precompressed copies of the static assets.
+
+    :param static_dir: Blueprint static folder
+    :return: manifest dict of logical name to built name (both relative to static_dir)
+    """
+    source_root = os.path.join(static_dir, SOURCE_DIR)
+    build_root = os.path.join(static_dir, BUILD_DIR)
+    shutil.rmtree(build_root, ignore_errors=True)
+
+    manifest = {}
+    for directory, _, names in os.walk(source_root):
+        for name in sorted(names):
+            if _skip(name, names):
+                continue
+            source = os.path.join(directory, name)
+            relative = os.path.relpath(source, static_dir)
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            built_name = name
+            root, ext = os.path.splitext(name)
+            if ext in HASHED_EXTENSIONS:
+                built_name = f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+            target_dir = os.path.join(build_root, os.path.relpath(directory, static_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            target = os.path.join(target_dir, built_name)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            if ext in COMPRESSIBLE_EXTENSIONS:
+                with open(target + '.gz', 'wb') as f:
+                    f.write(compress(data, 'gzip', level=9))
+                if brotli is not None:
+                    with open(target + '.br', 'wb') as f:
+                        f.write(compress(data, 'br', level=11))
+
+            manifest[relative.replace(os.sep, '/')] = os.path.relpath(target, static_dir).replace(os.sep, '/')
+
+    with open(os.path.join(build_root, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def build_if_stale(static_dir=STATIC_DIR):
+    """
+    Build the assets when there is no manifest or a source file is newer than it.
+
+    :param static_dir: Blueprint static folder
+    :return: manifest dict if a build ran, None if the build was up to date
+    """
+    try:
+        built_at = os.path.getmtime(os.path.join(static_dir, BUILD_DIR, MANIFEST))
+    except OSError:
+        return build(static_dir)
+    for directory, _, names in os.walk(os.path.join(static_dir, SOURCE_DIR)):
+        for name in names:
+            if not _skip(name, names) and os.path.getmtime(os.path.join(directory, name)) > built_at:
+                return build(static_dir)
+    return None
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """
+    Load the build manifest once per process.
+
+    :return: manifest dict, empty when assets have not been built
+    """
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(os.path.join(static_dir, BUILD_DIR, MANIFEST)) as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            _manifest = {}
+    return _manifest
+
+
+def asset_url(name):
+    """
+    Template helper: URL of the built (fingerprinted) version of a static asset.
+
+    :param name: Path relative to the static folder, e.g. 'dist/css/forms.css'
+    :return: URL under the Forms static route
+    """
+    return url_for('Forms.static', filename=load_manifest().get(name, name))
+
+
+def send_asset(blueprint, filename):
+    """
+    Serve a static file, preferring a precompressed variant the client accepts.
+
+    Fingerprinted files under ``build/`` are marked immutable.
+
+    :param blueprint: Blueprint owning the static folder
+    :param filename: Requested path relative to the static folder
+    :return: Flask response
+    """
+    static_dir = blueprint.static_folder
+    available = []
+    if filename.endswith(COMPRESSIBLE_EXTENSIONS):
+        available = [e for e, suffix in (('br', '.br'), ('gzip', '.gz'))
+                     if os.path.isfile(os.path.join(static_dir, filename + suffix))]
+    encoding = choose_encoding(request.accept_encodings, available) if available else None
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if encoding:
+        suffix = '.br' if encoding == 'br' else '.gz'
+        response = send_from_directory(static_dir, filename + suffix, mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(static_dir, filename, mimetype=mimetype,
+                                       max_age=blueprint.get_send_file_max_age(filename))
+    if available:
+        response.vary.add('Accept-Encoding')
+    if filename.startswith(BUILD_DIR + '/'):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+if __name__ == '__main__':
+    built = build()
+    print(f"Built {len(built)} assets into {os.path.join(STATIC_DIR, BUILD_DIR)}")
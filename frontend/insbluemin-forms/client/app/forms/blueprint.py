@@ -1,5 +1,6 @@
 from insbluemin.core.blueprints import *
 from .views import *
+from .assets import send_asset
 
 
 class Forms(RenderBlueprint):
@@ -8,3 +9,8 @@ class Forms(RenderBlueprint):
 
     def register_views(self):
         self.add_view(FormsView)
+        self.add_view(MetricsView)
+
+    def send_static_file(self, filename):
+        """Serve /assets files, preferring precompressed and fingerprinted builds."""
+        return send_asset(self, filename)
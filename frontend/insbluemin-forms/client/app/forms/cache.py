@@ -0,0 +1,269 @@
+# Standard library imports
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, RLock
+
+from .shared import Generation
+
+# A cached form definition together with the version it was fetched at
+CachedForm = namedtuple('CachedForm', ['path', 'modified', 'data'])
+
+
+class LRUCache:
+    """Minimal thread-safe LRU mapping with a fixed capacity."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+                return self._data[key]
+            except KeyError:
+                return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def values(self):
+        with self._lock:
+            return list(self._data.values())
+
+    def after_fork(self):
+        self._lock = Lock()
+
+
+class _Entry:
+    __slots__ = ('form', 'stored_at')
+
+    def __init__(self, form, stored_at):
+        self.form = form
+        self.stored_at = stored_at
+
+
+class SchemaCache:
+    """
+    Bounded, in-process LRU cache of Form.io form definitions.
+
+    Entries are keyed by form path and versioned by the form's ``modified``
+    timestamp. Fresh entries are served directly; entries past their TTL are
+    still served while a single background refresh revalidates them against
+    Form.io, so a page view normally costs no upstream round trip.
+
+    With a shared store, loaded forms are published for the other workers,
+    and a local miss adopts a published copy before going upstream.
+    """
+
+    def __init__(self, loader, revalidator, maxsize=128, ttl=300, stale_ttl=3600, runner=None, store=None):
+        """
+        Initialize the cache.
+
+        :param loader: Callable ``loader(path)`` returning the full form dict
+        :param revalidator: Callable ``revalidator(path, modified)`` returning the
+                            upstream ``modified`` value for the form
+        :param maxsize: Maximum number of forms kept before LRU eviction
+        :param ttl: Seconds an entry is considered fresh
+        :param stale_ttl: Extra seconds a stale entry may be served while refreshing
+        :param runner: Optional callable wrapping background work (e.g. to push an app context)
+        :param store: Optional shared store (see shared.build_store)
+        """
+        self._loader = loader
+        self._revalidator = revalidator
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._runner = runner or (lambda fn, *args: fn(*args))
+        self._store = store
+        self._generation = Generation(store, 'schemas') if store is not None else None
+
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._loading = {}
+        self._lock = RLock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='forms-schema-cache')
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+        self.shared_hits = 0
+
+    def get(self, path):
+        """
+        Return the cached form for ``path``, loading or refreshing it as needed.
+
+        :param path: Form path
+        :return: CachedForm
+        """
+        now = time.time()
+        if self._generation is not None and self._generation.changed():
+            # Invalidated by another worker
+            self._clear()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                age = now - entry.stored_at
+                if age < self.ttl:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry.form
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(path)
+                    self.stale_hits += 1
+                    self._schedule_refresh(path, entry.form.modified)
+                    return entry.form
+            self.misses += 1
+
+            # Single-flight: concurrent misses for one path share a single upstream load
+            load_lock = self._loading.setdefault(path, Lock())
+
+        # Load outside the cache lock so slow upstream calls don't block other paths
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry.stored_at >= now:
+                    # Another thread loaded it while we waited
+                    return entry.form
+            try:
+                shared = self._adopt(path, now)
+                if shared is not None:
+                    return shared
+                return self._put(path, self._loader(path))
+            finally:
+                with self._lock:
+                    self._loading.pop(path, None)
+
+    def peek(self, path):
+        """
+        Return the cached form for ``path`` without loading or counting, or None.
+
+        :param path: Form path
+        :return: CachedForm or None
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            return entry.form if entry is not None else None
+
+    def invalidate(self, path=None):
+        """
+        Drop one cached form, or every cached form when ``path`` is None.
+
+        Also drops the copies held by other workers when a shared store is used.
+
+        :param path: Form path to invalidate
+        """
+        if self._store is not None:
+            # Published copies are keyed by generation, so this orphans them all
+            self._generation.bump()
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def after_fork(self):
+        """Keep the inherited entries, but not the parent's loads, refresh threads or locks."""
+        self._lock = RLock()
+        if self._generation is not None:
+            self._generation.after_fork()
+        self._loading = {}
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='forms-schema-cache')
+
+    def _clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Snapshot of the cache counters.
+
+        :return: dict of counter name to value
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'evictions': self.evictions,
+                'shared_hits': self.shared_hits,
+            }
+
+    def _put(self, path, data, stored_at=None, publish=True):
+        form = CachedForm(path, data.get('modified'), data)
+        stored_at = stored_at or time.time()
+        with self._lock:
+            self._entries[path] = _Entry(form, stored_at)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if publish and self._store is not None:
+            self._store.set(self._shared_key(path), {'data': data, 'stored_at': stored_at},
+                            ttl=self.ttl + self.stale_ttl)
+        return form
+
+    def _shared_key(self, path):
+        return f"schema:{self._generation.value}:{path}"
+
+    def _adopt(self, path, now):
+        """Take over a copy of the form another worker published, if it is still servable."""
+        if self._store is None:
+            return None
+        shared = self._store.get(self._shared_key(path))
+        if not shared or now - shared['stored_at'] >= self.ttl + self.stale_ttl:
+            return None
+        form = self._put(path, shared['data'], stored_at=shared['stored_at'], publish=False)
+        with self._lock:
+            self.shared_hits += 1
+            if now - shared['stored_at'] >= self.ttl:
+                self._schedule_refresh(path, form.modified)
+        return form
+
+    def _schedule_refresh(self, path, modified):
+        # Single-flight: at most one refresh per path in the background
+        if path in self._refreshing:
+            return
+        self._refreshing.add(path)
+        self._executor.submit(self._runner, self._refresh, path, modified)
+
+    def _refresh(self, path, modified):
+        try:
+            if self._revalidator(path, modified) == modified:
+                # Unchanged upstream: just restart the TTL clock
+                with self._lock:
+                    entry = self._entries.get(path)
+                if entry is not None:
+                    # Restart the clock here and for the other workers
+                    self._put(path, entry.form.data)
+            else:
+                self._put(path, self._loader(path))
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(path)
@@ -0,0 +1,297 @@
+# Standard library imports
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from urllib.parse import quote
+
+from .permissions import parse_required_actions
+from .shared import Generation
+
+# Fields needed to build a catalog record
+CATALOG_FIELDS = 'title,name,path,tags,components,modified'
+
+# Upper bound on forms returned per listing call (Form.io defaults to 10)
+CATALOG_PAGE_LIMIT = 1000
+
+# Shared-store lock held by the worker syncing the catalog, and how long it may hold it
+SYNC_LOCK_KEY = 'catalog:sync'
+SYNC_LOCK_TTL = 30
+
+# Published snapshots outlive their freshness: a cold worker starts from one and syncs incrementally
+SNAPSHOT_TTL = 86400
+
+
+def build_record(form):
+    """
+    Digest a Form.io form into the slim record served by the forms index.
+
+    :param form: Form dict as returned by the Form.io API
+    :return: dict with title, name, path, description, category, required and modified
+    """
+    tags = form.get('tags') or []
+    categories = [tag.split('cat:', 1)[1] for tag in tags if tag.startswith('cat:')]
+    components = form.get('components') or [{}]
+    return {
+        '_id': form.get('_id'),
+        'title': form.get('title'),
+        'name': form.get('name'),
+        'path': form.get('path'),
+        # Use first component's 'content' as description
+        'description': components[0].get('content', ''),
+        'category': categories,
+        'category_keys': frozenset(c.lower() for c in categories),
+        'required': parse_required_actions(tags),
+        'tagged': bool(tags),
+        'modified': form.get('modified'),
+    }
+
+
+def index_categories(records):
+    """
+    Build the category index of a catalog.
+
+    :param records: dict of path to record, in listing order
+    :return: dict of lowercased category to list of paths
+    """
+    by_category = {}
+    for path, record in records.items():
+        for key in record['category_keys']:
+            by_category.setdefault(key, []).append(path)
+    return by_category
+
+
+class FormCatalog:
+    """
+    Materialized catalog of Form.io forms with a category index.
+
+    The catalog keeps one slim record per form and refreshes incrementally:
+    each sync only downloads forms modified since the newest timestamp seen,
+    plus a path-only listing used to drop deleted forms.
+
+    With a shared store, the worker that syncs publishes a snapshot and the
+    other workers adopt it instead of syncing themselves.
+    """
+
+    def __init__(self, client, ttl=60, runner=None, store=None):
+        """
+        Initialize the catalog.
+
+        :param client: FormioAPI instance used for upstream calls
+        :param ttl: Seconds between incremental syncs
+        :param runner: Optional callable wrapping background work (e.g. to push an app context)
+        :param store: Optional shared store (see shared.build_store)
+        """
+        self._client = client
+        self.ttl = ttl
+        self._runner = runner or (lambda fn, *args: fn(*args))
+        self._store = store
+        self._generation = Generation(store, 'catalog') if store is not None else None
+
+        self._records = {}
+        self._by_category = {}
+        self._watermark = None
+        self._synced_at = 0
+        self._syncing = False
+        self._lock = RLock()
+        self._sync_lock = RLock()  # One sync at a time, so the watermark is read and advanced consistently
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forms-catalog')
+
+        # Counters
+        self.syncs = 0
+        self.sync_errors = 0
+        self.forms_fetched = 0
+        self.adopted = 0
+
+    def forms(self, category=None):
+        """
+        Return catalog records, optionally restricted to one category.
+
+        :param category: Category name (case-insensitive) or None for all forms
+        :return: list of record dicts in upstream order
+        """
+        self._ensure_fresh()
+        with self._lock:
+            if category:
+                paths = self._by_category.get(category.lower(), ())
+                return [self._records[p] for p in paths]
+            return list(self._records.values())
+
+    def get(self, path):
+        """
+        Return the catalog record for a form path, or None.
+
+        :param path: Form path
+        :return: record dict or None
+        """
+        self._ensure_fresh()
+        with self._lock:
+            return self._records.get(path)
+
+    def categories(self):
+        """Return the known category keys (lowercased)."""
+        self._ensure_fresh()
+        with self._lock:
+            return sorted(self._by_category)
+
+    @property
+    def version(self):
+        """Identifier of the catalog contents: newest 'modified' seen plus the form count."""
+        with self._lock:
+            return f"{self._watermark}:{len(self._records)}"
+
+    def invalidate(self):
+        """Force a full rebuild on the next access, in every worker when a shared store is used."""
+        if self._store is not None:
+            self._generation.bump()
+        self._reset()
+
+    def after_fork(self):
+        """Keep the inherited records, but not the parent's sync thread or locks."""
+        self._lock = RLock()
+        self._sync_lock = RLock()
+        if self._generation is not None:
+            self._generation.after_fork()
+        self._syncing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forms-catalog')
+
+    def _reset(self):
+        with self._lock:
+            self._records = {}
+            self._by_category = {}
+            self._watermark = None
+            self._synced_at = 0
+
+    def stats(self):
+        """
+        Snapshot of the catalog counters.
+
+        :return: dict of counter name to value
+        """
+        with self._lock:
+            return {
+                'size': len(self._records),
+                'categories': len(self._by_category),
+                'syncs': self.syncs,
+                'sync_errors': self.sync_errors,
+                'forms_fetched': self.forms_fetched,
+                'adopted': self.adopted,
+                'age': time.time() - self._synced_at if self._synced_at else None,
+            }
+
+    def sync(self):
+        """
+        Bring the catalog up to date with Form.io.
+
+        The first call performs a full load; later calls only fetch forms
+        whose ``modified`` timestamp is newer than the last one seen.
+        """
+        with self._sync_lock:
+            if self._store is None:
+                return self._sync()
+            if self._adopt() and time.time() - self._synced_at < self.ttl:
+                # Another worker synced recently
+                return
+            locked = self._store.add(SYNC_LOCK_KEY, os.getpid(), ttl=SYNC_LOCK_TTL)
+            if not locked and self._synced_at:
+                # Another worker is syncing; its snapshot is adopted on a later access
+                return
+            try:
+                self._sync()
+                self._publish()
+            finally:
+                if locked:
+                    self._store.delete(SYNC_LOCK_KEY)
+
+    def _sync(self):
+        query = f"form?type=form&select={CATALOG_FIELDS}&limit={CATALOG_PAGE_LIMIT}&sort=title"
+        full = self._watermark is None
+        if not full:
+            query += f"&modified__gt={quote(self._watermark)}"
+        changed = self._client._fetch_json(query)
+        # Path-only listing is cheap and lets us notice deleted forms
+        live = None if full else {
+            f.get('path') for f in self._client._fetch_json(
+                f"form?type=form&select=path&limit={CATALOG_PAGE_LIMIT}")
+        }
+
+        with self._lock:
+            records = {} if full else dict(self._records)
+            for form in changed:
+                record = build_record(form)
+                records[record['path']] = record
+                if record['modified'] and (self._watermark is None or record['modified'] > self._watermark):
+                    self._watermark = record['modified']
+            if live is not None:
+                records = {p: r for p, r in records.items() if p in live}
+            if not full:
+                # Keep listing order stable when new forms arrive
+                records = dict(sorted(records.items(), key=lambda item: item[1]['title'] or ''))
+
+            self._records = records
+            self._by_category = index_categories(records)
+            self._synced_at = time.time()
+            self.syncs += 1
+            self.forms_fetched += len(changed)
+
+    def _snapshot_key(self):
+        return f"catalog:{self._generation.value}"
+
+    def _publish(self):
+        with self._lock:
+            snapshot = {
+                'records': [dict(record, category_keys=sorted(record['category_keys']),
+                                 required=sorted(record['required'])) for record in self._records.values()],
+                'watermark': self._watermark,
+                'synced_at': self._synced_at,
+            }
+        self._store.set(self._snapshot_key(), snapshot, ttl=SNAPSHOT_TTL)
+
+    def _adopt(self):
+        """Take over the snapshot another worker published, if it is newer than ours."""
+        snapshot = self._store.get(self._snapshot_key())
+        if not snapshot or snapshot['synced_at'] <= self._synced_at:
+            return False
+        records = {
+            record['path']: dict(record, category_keys=frozenset(record['category_keys']),
+                                 required=frozenset(record['required']))
+            for record in snapshot['records']
+        }
+        with self._lock:
+            self._records = records
+            self._by_category = index_categories(records)
+            self._watermark = snapshot['watermark']
+            self._synced_at = snapshot['synced_at']
+            self.adopted += 1
+        return True
+
+    def _ensure_fresh(self):
+        if self._generation is not None and self._generation.changed():
+            # Invalidated by another worker
+            self._reset()
+        with self._lock:
+            if not self._synced_at:
+                stale, empty = True, True
+            else:
+                stale, empty = time.time() - self._synced_at >= self.ttl, False
+            if stale and not empty:
+                # Serve the current catalog and refresh in the background
+                if not self._syncing:
+                    self._syncing = True
+                    self._executor.submit(self._runner, self._background_sync)
+                return
+        if empty:
+            # Cold start: concurrent request threads wait for a single full load
+            with self._sync_lock:
+                if not self._synced_at:
+                    self.sync()
+
+    def _background_sync(self):
+        try:
+            self.sync()
+        except Exception:
+            with self._lock:
+                self.sync_errors += 1
+        finally:
+            with self._lock:
+                self._syncing = False
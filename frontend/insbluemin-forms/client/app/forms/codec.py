@@ -0,0 +1,165 @@
+# Standard library imports
+import base64
+import hashlib
+
+# Third-party imports
+from hashids import Hashids
+
+from .cache import LRUCache
+
+# Prefix marking ids produced by the keyed-permutation codec. Hashids output can
+# only start with it if the alphabet contains '-', which build time rejects.
+KEYED_PREFIX = 'k1-'
+
+
+class HashidsCodec:
+    """Submission id codec backed by Hashids (the historical URL format)."""
+
+    def __init__(self, salt, alphabet, min_length=24):
+        """
+        :param salt: Hashids salt
+        :param alphabet: Hashids alphabet
+        :param min_length: Minimum length of encoded ids
+        """
+        self.alphabet = alphabet
+        self._hashids = Hashids(salt=salt, min_length=min_length, alphabet=alphabet)
+
+    def encode(self, object_id):
+        return self._hashids.encode_hex(object_id)
+
+    def decode(self, token):
+        return self._hashids.decode_hex(token)
+
+
+class KeyedPermutationCodec:
+    """
+    Reversible keyed permutation of 12-byte ObjectIds.
+
+    A four-round Feistel network over two 48-bit halves with a keyed BLAKE2b
+    round function. Output is the permuted 12 bytes in URL-safe base64
+    (16 characters), which is considerably cheaper than Hashids.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, key):
+        """
+        :param key: Secret key (bytes or str), at most 64 bytes are used
+        """
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        self._key = hashlib.blake2b(key, digest_size=32).digest()
+
+    def _round(self, half, index):
+        return hashlib.blake2b(half + bytes((index,)), key=self._key, digest_size=6).digest()
+
+    def encode(self, object_id):
+        data = bytes.fromhex(object_id)
+        left, right = data[:6], data[6:]
+        for index in range(self.ROUNDS):
+            left, right = right, bytes(a ^ b for a, b in zip(left, self._round(right, index)))
+        return base64.urlsafe_b64encode(left + right).decode('ascii')
+
+    def decode(self, token):
+        data = base64.urlsafe_b64decode(token.encode('ascii'))
+        if len(data) != 12:
+            raise ValueError("Invalid token length")
+        left, right = data[:6], data[6:]
+        for index in reversed(range(self.ROUNDS)):
+            left, right = bytes(a ^ b for a, b in zip(right, self._round(left, index))), left
+        return (left + right).hex()
+
+
+class SubmissionIdCodec:
+    """
+    Versioned, cached submission id codec used by FormsView.
+
+    New ids are produced by the configured codec. Ids starting with
+    ``KEYED_PREFIX`` decode with the keyed permutation and every other id with
+    Hashids, so URLs handed out before switching codecs keep working. Recently
+    seen ids are cached in both directions.
+    """
+
+    def __init__(self, hashids_codec, keyed_codec=None, cache_size=4096):
+        """
+        :param hashids_codec: HashidsCodec used for legacy (unprefixed) ids
+        :param keyed_codec: Optional KeyedPermutationCodec used for new ids
+        :param cache_size: Entries kept in each direction's LRU cache
+        """
+        if keyed_codec is not None and KEYED_PREFIX[-1] in hashids_codec.alphabet:
+            raise ValueError(f"HASHIDS_ALPHABET must not contain {KEYED_PREFIX[-1]!r} when the keyed codec is enabled")
+        self._hashids = hashids_codec
+        self._keyed = keyed_codec
+        self._encoded = LRUCache(cache_size)
+        self._decoded = LRUCache(cache_size)
+
+    def encode(self, object_id):
+        """
+        Obfuscate one ObjectId.
+
+        :param object_id: 24-character hex string
+        :return: obfuscated id
+        """
+        token = self._encoded.get(object_id)
+        if token is None:
+            if self._keyed is not None:
+                token = KEYED_PREFIX + self._keyed.encode(object_id)
+            else:
+                token = self._hashids.encode(object_id)
+            self._encoded.set(object_id, token)
+            self._decoded.set(token, object_id)
+        return token
+
+    def after_fork(self):
+        self._encoded.after_fork()
+        self._decoded.after_fork()
+
+    def encode_many(self, object_ids):
+        """
+        Obfuscate a whole listing at once.
+
+        :param object_ids: Iterable of 24-character hex strings
+        :return: list of obfuscated ids, in the same order
+        """
+        return [self.encode(object_id) for object_id in object_ids]
+
+    def decode(self, token):
+        """
+        Recover the ObjectId behind an obfuscated id.
+
+        :param token: Obfuscated id in either format
+        :return: 24-character hex string, or '' if it cannot be decoded
+        """
+        object_id = self._decoded.get(token)
+        if object_id is None:
+            if token.startswith(KEYED_PREFIX):
+                if self._keyed is None:
+                    return ''
+                object_id = self._keyed.decode(token[len(KEYED_PREFIX):])
+            else:
+                object_id = self._hashids.decode(token)
+            if object_id:
+                self._decoded.set(token, object_id)
+        return object_id
+
+
+def build_codec(config):
+    """
+    Build the submission id codec from application config.
+
+    FORMS_ID_CODEC selects 'hashids' (default) or 'keyed' for new ids. The
+    keyed codec uses FORMS_ID_CODEC_KEY, or a key derived from HASHIDS_SALT.
+
+    :param config: Flask config mapping
+    :return: SubmissionIdCodec
+    """
+    salt = config.get('HASHIDS_SALT', 'default_salt')
+    hashids_codec = HashidsCodec(
+        salt=salt,
+        alphabet=config.get('HASHIDS_ALPHABET', 'abcdefghijklmnopqrstuvwxyz1234567890'),
+        min_length=24
+    )
+    keyed_codec = None
+    if config.get('FORMS_ID_CODEC', 'hashids') == 'keyed':
+        keyed_codec = KeyedPermutationCodec(config.get('FORMS_ID_CODEC_KEY') or f"forms-id-codec:{salt}")
+    return SubmissionIdCodec(hashids_codec, keyed_codec, cache_size=config.get('FORMS_ID_CACHE_SIZE', 4096))
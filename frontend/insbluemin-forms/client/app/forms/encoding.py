@@ -0,0 +1,42 @@
+# Standard library imports
+import gzip
+
+try:
+    import brotli  # Optional: enables 'br' responses
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+# Encodings we can produce, in order of preference on equal quality
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings, available=SUPPORTED_ENCODINGS):
+    """
+    Pick the best content encoding the client accepts.
+
+    :param accept_encodings: werkzeug Accept object (``request.accept_encodings``)
+    :param available: Encodings on offer, most preferred first
+    :return: encoding name, or None for identity
+    """
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level=None):
+    """
+    Compress bytes with the given content encoding.
+
+    :param data: Raw bytes
+    :param encoding: 'gzip' or 'br'
+    :param level: Compression level (defaults favour speed for dynamic responses)
+    :return: compressed bytes
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=5 if level is None else level)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
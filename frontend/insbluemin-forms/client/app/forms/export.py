@@ -0,0 +1,174 @@
+# Standard library imports
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Component types that never carry submission data
+NON_DATA_TYPES = {'button', 'content', 'htmlelement'}
+
+# Columns written before the form's own fields
+META_COLUMNS = ['obfuscated_id', 'created']
+
+_DONE = object()
+
+
+def schema_columns(components, exclude=('auth_user_email',)):
+    """
+    Collect the data keys of a form from its component tree, in display order.
+
+    Layout components (panels, columns, tables, fieldsets) are walked through;
+    their children's keys are top-level keys in ``submission.data``.
+
+    :param components: Form.io components list
+    :param exclude: Keys to leave out
+    :return: list of data keys
+    """
+    columns = []
+
+    def walk(items):
+        for component in items or ():
+            if component.get('input') and component.get('type') not in NON_DATA_TYPES:
+                key = component.get('key')
+                if key and key not in exclude and key not in columns:
+                    columns.append(key)
+                # Data grids, containers etc. own their children's values
+                continue
+            walk(component.get('components'))
+            for column in component.get('columns') or ():
+                walk(column.get('components'))
+            for row in component.get('rows') or ():
+                for cell in row or ():
+                    walk(cell.get('components'))
+
+    walk(components)
+    return columns
+
+
+def prefetched(pages, runner=None):
+    """
+    Iterate ``pages`` while the next page is already being fetched in the background.
+
+    Only the worker thread advances the underlying iterator, so at most two
+    pages are held in memory at once.
+
+    :param pages: Iterable of pages (e.g. FormioAPI.iter_pages)
+    :param runner: Optional callable wrapping the fetch (e.g. to push an app context)
+    :return: generator of pages
+    """
+    runner = runner or (lambda fn, *args: fn(*args))
+    iterator = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='forms-export')
+    try:
+        future = executor.submit(runner, next, iterator, _DONE)
+        while True:
+            page = future.result()
+            if page is _DONE:
+                return
+            future = executor.submit(runner, next, iterator, _DONE)
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _cell(value):
+    """Flatten a submission value for CSV output."""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def ndjson_lines(pages, convert):
+    """
+    Serialize rows as newline-delimited JSON.
+
+    :param pages: Iterable of submission lists
+    :param convert: Callable turning a raw submission into an output dict
+    :return: generator of text lines
+    """
+    for items in pages:
+        yield ''.join(json.dumps(convert(sub), ensure_ascii=False) + '\n' for sub in items)
+
+
+def csv_lines(pages, convert, columns):
+    """
+    Serialize rows as CSV with a fixed header.
+
+    :param pages: Iterable of submission lists
+    :param convert: Callable turning a raw submission into an output dict
+    :param columns: Data keys to write after the meta columns
+    :return: generator of text chunks (one per page)
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(META_COLUMNS + columns)
+    yield buffer.getvalue()
+
+    for items in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        for sub in items:
+            row = convert(sub)
+            data = row.get('data') or {}
+            writer.writerow([row[c] for c in META_COLUMNS] + [_cell(data.get(c)) for c in columns])
+        yield buffer.getvalue()
+
+
+def data_keys(subs, columns, exclude=('submit',)):
+    """
+    List the form's schema keys, then any other data key found in the rows.
+
+    :param subs: Submission dicts
+    :param columns: Data keys in schema order (see schema_columns)
+    :param exclude: Data keys left out
+    :return: list of data keys
+    """
+    keys = [c for c in columns if c not in exclude]
+    known = set(keys)
+    for sub in subs:
+        for key in sub.get('data') or ():
+            if key not in known and key not in exclude:
+                known.add(key)
+                keys.append(key)
+    return keys
+
+
+def table_columns(subs, columns, exclude=('submit', 'auth_user_email')):
+    """
+    Data keys shown as columns of the submissions table.
+
+    The header and every row fragment swapped in by a live search are built
+    from this list, so they must not depend on which rows a page holds: the
+    schema keys are used, and the rows' own keys only for a form whose schema
+    has none.
+
+    :param subs: Submission dicts
+    :param columns: Data keys in schema order (see schema_columns)
+    :param exclude: Data keys never shown (the author is the viewer on every row)
+    :return: list of data keys
+    """
+    return [c for c in columns if c not in exclude] or data_keys(subs, (), exclude)
+
+
+def columnar(subs, columns, exclude=('submit',)):
+    """
+    Pack converted submissions as a column list plus row arrays.
+
+    Columns are the meta columns, then the form's schema keys, then any other
+    data key found in the rows, so no value is lost when submissions predate
+    a schema change.
+
+    :param subs: Submissions prepared by FormsView._submission_rows
+    :param columns: Data keys in schema order (see schema_columns)
+    :param exclude: Data keys never sent
+    :return: dict with 'columns' and 'rows'
+    """
+    keys = data_keys(subs, columns, exclude)
+
+    rows = []
+    for sub in subs:
+        data = sub.get('data') or {}
+        rows.append([sub['obfuscated_id'], sub['created'].isoformat()] + [data.get(key) for key in keys])
+    return {'columns': META_COLUMNS + keys, 'rows': rows}
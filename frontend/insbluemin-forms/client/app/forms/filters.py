@@ -0,0 +1,100 @@
+# Standard library imports
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+# Filter operators accepted as 'f.<field>__<op>', mapped to Form.io query suffixes
+FILTER_OPERATORS = {
+    'eq': '',
+    'ne': '__ne',
+    'gt': '__gt',
+    'gte': '__gte',
+    'lt': '__lt',
+    'lte': '__lte',
+    'in': '__in',
+    'contains': '__regex',
+}
+
+# Query-string prefix of field filters, e.g. 'f.status=closed' or 'f.amount__gte=10'
+FILTER_PREFIX = 'f.'
+
+
+def contains_pattern(text):
+    """
+    Build a case-insensitive Form.io regex matching ``text`` literally.
+
+    User input is escaped, so it can't inject regex syntax (or expensive patterns) upstream.
+    The '/' delimiter is escaped too (``re.escape`` leaves it alone), or a search like
+    '12/05' would end the literal early.
+
+    :param text: Search text
+    :return: regex literal, e.g. '/foo\\.bar/i'
+    """
+    pattern = re.escape(text).replace('/', r'\/')
+    return f"/{pattern}/i"
+
+
+def parse_date_bound(value, end=False):
+    """
+    Parse a 'from'/'to' query value into an ISO timestamp for Form.io.
+
+    A bare date covers the whole day: as an end bound it is moved to the
+    start of the following day (used with an exclusive '__lt').
+
+    :param value: 'YYYY-MM-DD' or an ISO 8601 timestamp
+    :param end: Whether the value is the upper bound of the range
+    :raises ValueError: If the value is not a date
+    :return: ISO 8601 UTC timestamp
+    """
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    else:
+        moment = datetime.combine(day + timedelta(days=1) if end else day, time())
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def submission_query(args, fields):
+    """
+    Translate search, filter and date range parameters into Form.io query operators.
+
+    Query Parameters:
+      - q, field: Case-insensitive search for ``q`` in ``field`` (default: the first field)
+      - f.<field>[__<op>]: Field filter; op is one of FILTER_OPERATORS (default 'eq')
+      - from, to: Creation date range; a bare 'to' date includes that whole day
+
+    Form.io combines parameters with AND and has no OR, so search covers one field.
+
+    :param args: Request query arguments
+    :param fields: Data keys of the form that may be searched and filtered
+    :raises ValueError: On an unknown field, operator or an invalid date
+    :return: dict of Form.io query parameters
+    """
+    query = {}
+
+    search = args.get('q', '').strip()
+    if search:
+        field = args.get('field') or (fields[0] if fields else '')
+        if field not in fields:
+            raise ValueError(f"Unknown search field: {field}")
+        query[f"data.{field}__regex"] = contains_pattern(search)
+
+    for name, value in args.items():
+        if not name.startswith(FILTER_PREFIX) or value == '':
+            continue
+        field, _, operator = name[len(FILTER_PREFIX):].partition('__')
+        if field not in fields:
+            raise ValueError(f"Unknown filter field: {field}")
+        if (operator or 'eq') not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {operator}")
+        if operator == 'contains':
+            value = contains_pattern(value)
+        query[f"data.{field}{FILTER_OPERATORS[operator or 'eq']}"] = value
+
+    if args.get('from'):
+        query['created__gte'] = parse_date_bound(args['from'])
+    if args.get('to'):
+        query['created__lt'] = parse_date_bound(args['to'], end=True)
+    return query
@@ -0,0 +1,245 @@
+# Standard library imports
+import bisect
+import time
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+
+# Third-party imports
+from flask import current_app, g, has_request_context
+from werkzeug.exceptions import HTTPException
+
+# Default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Default size buckets, in bytes
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2)
+
+# Buckets for write-behind delivery lag, in seconds
+LAG_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = Lock()
+
+    def _key(self, labels):
+        return tuple(labels.get(name, '') for name in self.label_names)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items()]
+        lines = self.header()
+        names = self.label_names + ('le',)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(float(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Process-local metric registry rendered in the Prometheus text format.
+
+    Besides metrics created here, collectors can be added: callables
+    returning ``(name, help, type, [(labels_dict, value), ...])`` tuples,
+    used to publish the stats() snapshots of caches and managers as gauges.
+    With several gunicorn workers each process reports its own values.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = Lock()
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def add_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def after_fork(self):
+        """Replace every lock in a forked child, in case a parent thread held one at fork time."""
+        self._lock = Lock()
+        for metric in self._metrics.values():
+            metric._lock = Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        """
+        Render every metric.
+
+        :return: text/plain body in the Prometheus exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for name, help_text, kind, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    names = tuple(labels)
+                    lines.append(f"{name}{_format_labels(names, [labels[n] for n in names])} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+UPSTREAM_SECONDS = REGISTRY.histogram(
+    'forms_upstream_request_seconds', 'Latency of Form.io calls.', labels=('method',))
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    'forms_upstream_responses_total', 'Form.io responses by status code.', labels=('method', 'status'))
+UPSTREAM_BYTES = REGISTRY.histogram(
+    'forms_upstream_response_bytes', 'Size of Form.io response bodies.', labels=('method',), buckets=SIZE_BUCKETS)
+PHASE_SECONDS = REGISTRY.histogram(
+    'forms_phase_seconds', 'Time spent per request phase (token, permissions, hashids, render).', labels=('phase',))
+REQUEST_SECONDS = REGISTRY.histogram(
+    'forms_request_seconds', 'Latency of Forms endpoints.', labels=('endpoint', 'status'))
+RESPONSE_BYTES = REGISTRY.histogram(
+    'forms_response_bytes', 'Size of Forms endpoint responses.', labels=('endpoint',), buckets=SIZE_BUCKETS)
+SPOOL_DELIVERY_LAG = REGISTRY.histogram(
+    'forms_spool_delivery_lag_seconds', 'Time from accepting a spooled submission to its delivery.', buckets=LAG_BUCKETS)
+
+
+@contextmanager
+def phase(name):
+    """
+    Time a block as a named phase of the current request.
+
+    The duration is recorded in ``forms_phase_seconds`` and added to the
+    request's phase breakdown used by the slow-request log.
+
+    :param name: Phase name, e.g. 'upstream' or 'render'
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.observe(elapsed, phase=name)
+        if has_request_context():
+            phases = g.setdefault('forms_phases', {})
+            phases[name] = phases.get(name, 0.0) + elapsed
+
+
+def instrumented(endpoint):
+    """
+    Decorator recording latency, status and response size of a view method.
+
+    Requests slower than FORMS_SLOW_REQUEST_SECONDS (when set) are logged
+    with their per-phase breakdown.
+
+    :param endpoint: Endpoint label used in the metrics
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            g.forms_phases = {}
+            started = time.perf_counter()
+            status = 500
+            response = None
+            try:
+                response = current_app.make_response(fn(*args, **kwargs))
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.code
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, status=status)
+                if response is not None and not response.is_streamed:
+                    RESPONSE_BYTES.observe(response.calculate_content_length() or 0, endpoint=endpoint)
+                slow = current_app.config.get('FORMS_SLOW_REQUEST_SECONDS')
+                if slow and elapsed >= slow:
+                    breakdown = ', '.join(f"{k}={v * 1000:.1f}ms" for k, v in g.forms_phases.items())
+                    current_app.logger.warning(
+                        f"Slow request {endpoint} ({status}) took {elapsed * 1000:.1f}ms: {breakdown}")
+        return wrapper
+    return decorator
@@ -0,0 +1,78 @@
+# Standard library imports
+import math
+import re
+
+# Form.io answers list calls with e.g. 'Content-Range: 0-9/57' (or '*/0' when empty)
+CONTENT_RANGE_PATTERN = re.compile(r'(?:\w+\s+)?(?:(\d+)-(\d+)|\*)/(\d+|\*)')
+
+# Accepted values for the 'sort' query parameter, e.g. '-created' or 'data.name'
+SORT_PATTERN = re.compile(r'-?[A-Za-z_][\w.]*')
+
+
+def parse_content_range(value):
+    """
+    Parse a Form.io Content-Range header.
+
+    :param value: Header value, e.g. '0-9/57'
+    :return: tuple (start, end, total); start/end are None for an empty range and
+             total is None when unknown or the header is missing/invalid
+    """
+    match = CONTENT_RANGE_PATTERN.fullmatch((value or '').strip())
+    if not match:
+        return None, None, None
+    start, end, total = match.groups()
+    return (
+        int(start) if start is not None else None,
+        int(end) if end is not None else None,
+        int(total) if total not in (None, '*') else None,
+    )
+
+
+class Page:
+    """A window into a paginated upstream listing."""
+
+    __slots__ = ('number', 'size', 'total')
+
+    def __init__(self, number, size, total=None):
+        """
+        :param number: 1-based page number
+        :param size: Items per page
+        :param total: Total number of items upstream, if known
+        """
+        self.number = number
+        self.size = size
+        self.total = total
+
+    @property
+    def skip(self):
+        """Number of items before this page."""
+        return (self.number - 1) * self.size
+
+    @property
+    def pages(self):
+        """Total number of pages, or None if the total is unknown."""
+        if self.total is None:
+            return None
+        return max(math.ceil(self.total / self.size), 1)
+
+    @property
+    def has_prev(self):
+        return self.number > 1
+
+    @property
+    def has_next(self):
+        if self.total is None:
+            return False
+        return self.skip + self.size < self.total
+
+    def content_range(self, count):
+        """
+        Build the Content-Range header advertised to clients for this page.
+
+        :param count: Number of items actually returned
+        :return: header value, e.g. 'items 0-49/1234'
+        """
+        total = '*' if self.total is None else self.total
+        if not count:
+            return f"items */{total}"
+        return f"items {self.skip}-{self.skip + count - 1}/{total}"
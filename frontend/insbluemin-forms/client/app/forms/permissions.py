@@ -0,0 +1,189 @@
+# Standard library imports
+from threading import Lock
+
+from .cache import LRUCache
+from .shared import Generation
+
+
+def parse_required_actions(form_tags):
+    """
+    Extract the actions required by a form from its 'perm:' tags.
+
+    :param form_tags: List of tags from the form metadata
+    :return: frozenset of action names (empty for public forms)
+    """
+    return frozenset(tag.split(':')[1] for tag in (form_tags or []) if tag.startswith('perm:'))
+
+
+def action_suffixes(user_permissions):
+    """
+    Build every dotted suffix of a user's permissions.
+
+    ``p.endswith('.' + action)`` holds for some permission ``p`` exactly when
+    ``action`` is in this set, so the per-form check becomes a set lookup.
+
+    :param user_permissions: List of permission strings the user has
+    :return: frozenset of suffixes
+    """
+    suffixes = set()
+    for permission in user_permissions or ():
+        index = permission.find('.')
+        while index != -1:
+            suffixes.add(permission[index + 1:])
+            index = permission.find('.', index + 1)
+    return frozenset(suffixes)
+
+
+class PermissionEngine:
+    """
+    Precompiled form permission checks.
+
+    User permissions are compiled once into a set of action suffixes, each
+    form version's 'perm:' tags are parsed once, and decisions are cached per
+    (user, form version).
+
+    Decisions are cheaper to recompute than to fetch from a shared store, so
+    only invalidation is shared between workers.
+    """
+
+    def __init__(self, maxsize=4096, store=None):
+        """
+        Initialize the engine.
+
+        :param maxsize: Maximum number of entries kept in each internal cache
+        :param store: Optional shared store (see shared.build_store)
+        """
+        self._store = store
+        self._generation = Generation(store, 'permissions') if store is not None else None
+        self._users = LRUCache(maxsize)
+        self._forms = LRUCache(maxsize)
+        self._decisions = LRUCache(maxsize * 4)
+
+        # Counters
+        self.decision_hits = 0
+        self.decision_misses = 0
+        self._counter_lock = Lock()
+
+    def compile_user(self, user_permissions):
+        """
+        Return the action suffix set for a user's permissions, cached per permission set.
+
+        :param user_permissions: List of permission strings the user has
+        :return: frozenset of action suffixes
+        """
+        if self._generation is not None and self._generation.changed():
+            # Invalidated by another worker
+            self._clear()
+        key = tuple(user_permissions or ())
+        suffixes = self._users.get(key)
+        if suffixes is None:
+            suffixes = action_suffixes(key)
+            self._users.set(key, suffixes)
+        return suffixes
+
+    def compile_form(self, form):
+        """
+        Return the actions required by a form, cached per form version.
+
+        :param form: Form dict (uses '_id'/'path', 'modified' and 'tags')
+        :return: frozenset of required actions
+        """
+        version = self.form_version(form)
+        if version is None:
+            return parse_required_actions(form.get('tags'))
+        required = self._forms.get(version)
+        if required is None:
+            required = parse_required_actions(form.get('tags'))
+            self._forms.set(version, required)
+        return required
+
+    @staticmethod
+    def form_version(form):
+        """Return a hashable (id, modified) key for a form, or None if it is not versioned."""
+        form_id = form.get('_id') or form.get('path')
+        modified = form.get('modified')
+        if not form_id or not modified:
+            return None
+        return form_id, modified
+
+    @staticmethod
+    def allows(suffixes, required_actions):
+        """
+        Check compiled user suffixes against a form's required actions.
+
+        :param suffixes: Result of compile_user
+        :param required_actions: Result of compile_form / parse_required_actions
+        :return: True if the form is public or any required action is granted
+        """
+        return not required_actions or not suffixes.isdisjoint(required_actions)
+
+    def check(self, user_permissions, form):
+        """
+        Decide whether a user may access a form, caching the decision per form version.
+
+        :param user_permissions: List of permission strings the user has
+        :param form: Form dict (uses '_id'/'path', 'modified' and 'tags')
+        :return: bool
+        """
+        suffixes = self.compile_user(user_permissions)
+        version = self.form_version(form)
+        if version is None:
+            return self.allows(suffixes, parse_required_actions(form.get('tags')))
+
+        key = (suffixes, version)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self.allows(suffixes, self.compile_form(form))
+            self._decisions.set(key, decision)
+            with self._counter_lock:
+                self.decision_misses += 1
+        else:
+            with self._counter_lock:
+                self.decision_hits += 1
+        return decision
+
+    def filter(self, user_permissions, forms):
+        """
+        Keep the tagged forms a user may access, in a single pass.
+
+        Untagged entries are dropped, matching how form listings have always
+        been filtered.
+
+        :param user_permissions: List of permission strings the user has
+        :param forms: Iterable of form dicts
+        :return: list of permitted forms
+        """
+        return [form for form in forms if form.get('tags') and self.check(user_permissions, form)]
+
+    def invalidate(self):
+        """Drop every cached user, form and decision, in every worker when a shared store is used."""
+        if self._store is not None:
+            self._generation.bump()
+        self._clear()
+
+    def _clear(self):
+        self._users.clear()
+        self._forms.clear()
+        self._decisions.clear()
+
+    def after_fork(self):
+        """Replace every lock in a forked child, in case a parent thread held one at fork time."""
+        self._counter_lock = Lock()
+        for cache in (self._users, self._forms, self._decisions):
+            cache.after_fork()
+        if self._generation is not None:
+            self._generation.after_fork()
+
+    def stats(self):
+        """
+        Snapshot of the engine counters.
+
+        :return: dict of counter name to value
+        """
+        return {
+            'users': len(self._users),
+            'forms': len(self._forms),
+            'decisions': len(self._decisions),
+            'decision_hits': self.decision_hits,
+            'decision_misses': self.decision_misses,
+        }
@@ -0,0 +1,95 @@
+# Standard library imports
+import hashlib
+
+# Third-party imports
+from flask import Response, current_app, request
+
+from .encoding import choose_encoding, compress
+
+# JSON bodies smaller than this are sent uncompressed
+DEFAULT_COMPRESS_MIN_SIZE = 1024
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag value from version components.
+
+    Stable across processes (unlike ``hash()``), so every worker hands out
+    the same tag for the same content.
+
+    :param parts: Values identifying the representation (paths, 'modified' stamps, ...)
+    :return: ETag value without quotes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def not_modified(etag):
+    """
+    Answer a conditional GET without doing any further work.
+
+    :param etag: Current ETag of the representation
+    :return: 304 response if the client already has it, else None
+    """
+    if not etag:
+        return None
+    # Compressed variants carry their own strong tag, e.g. '<etag>-gzip'
+    for candidate in (etag, f"{etag}-br", f"{etag}-gzip"):
+        if request.if_none_match.contains(candidate):
+            response = Response(status=304)
+            response.set_etag(candidate)
+            response.vary.add('Accept-Encoding')
+            return response
+    return None
+
+
+def json_response(payload, etag=None, status=200):
+    """
+    Serialize a JSON payload once, with ETag/304 handling and negotiated compression.
+
+    :param payload: Data to serialize with the app's JSON provider
+    :param etag: ETag to use; defaults to a hash of the serialized body
+    :param status: HTTP status code
+    :return: Flask response
+    """
+    body = current_app.json.dumps(payload).encode('utf-8')
+    if etag is None:
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return bytes_response(body, etag, status=status)
+
+
+def bytes_response(body, etag, status=200, mimetype='application/json', variants=None):
+    """
+    Serve an already serialized body with ETag/304 handling and negotiated compression.
+
+    :param body: Response body bytes
+    :param etag: ETag of the body
+    :param status: HTTP status code
+    :param mimetype: Response mimetype
+    :param variants: Optional dict kept alongside a cached body, memoizing its
+                     compressed variants by encoding
+    :return: Flask response
+    """
+    response = not_modified(etag) if status == 200 else None
+    if response is not None:
+        return response
+
+    response = Response(body, status=status, mimetype=mimetype)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    if len(body) >= current_app.config.get('FORMS_COMPRESS_MIN_SIZE', DEFAULT_COMPRESS_MIN_SIZE):
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding:
+            if variants is None:
+                compressed = compress(body, encoding)
+            else:
+                compressed = variants.get(encoding)
+                if compressed is None:
+                    compressed = variants.setdefault(encoding, compress(body, encoding))
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{etag}-{encoding}")
+    return response
@@ -0,0 +1,230 @@
+"""
+Slimming of Form.io form definitions for rendering.
+
+The builder stores every component with its full property set, most of it
+defaults the renderer fills in anyway, plus builder-only bookkeeping. Each
+form version is compiled once: internal fields are removed at every depth,
+builder-only and default-valued properties are dropped, and the result is
+serialized once, minified and safe to embed in a <script> block.
+"""
+# Standard library imports
+import json
+from threading import Lock
+
+# Third-party imports
+from markupsafe import Markup
+
+from .cache import LRUCache
+from .responses import make_etag
+
+# Fields the browser must never see, wherever they sit in the component tree
+DEFAULT_INTERNAL_FIELDS = ('auth_user_email',)
+
+# Properties only the builder (or Form.io's server) reads. Not 'tableView': the renderer's
+# edit grids and submission tables read it to hide columns.
+BUILDER_ONLY_PROPERTIES = frozenset((
+    'lockKey', 'isNew', 'keyModified', 'dbIndex', 'encrypted',
+))
+
+# Properties whose value is the renderer's default for every component type
+DEFAULT_PROPERTIES = {
+    'placeholder': '',
+    'prefix': '',
+    'suffix': '',
+    'customClass': '',
+    'tabindex': '',
+    'tooltip': '',
+    'description': '',
+    'errorLabel': '',
+    'errors': '',
+    'customDefaultValue': '',
+    'calculateValue': '',
+    'customConditional': '',
+    'properties': {},
+    'attributes': {},
+    'tags': [],
+    'logic': [],
+    'hidden': False,
+    'disabled': False,
+    'autofocus': False,
+    'multiple': False,
+    'protected': False,
+    'calculateServer': False,
+    'allowCalculateOverride': False,
+    'showCharCount': False,
+    'showWordCount': False,
+}
+
+# Default values inside nested property objects; objects left empty are dropped
+DEFAULT_NESTED = {
+    'validate': {
+        'required': False,
+        'custom': '',
+        'customPrivate': False,
+        'pattern': '',
+        'minLength': '',
+        'maxLength': '',
+        'minWords': '',
+        'maxWords': '',
+        'json': '',
+        'customMessage': '',
+        'strictDateValidation': False,
+        'multiple': False,
+        'unique': False,
+        'onlyAvailableItems': False,
+    },
+    'conditional': {'show': None, 'when': None, 'eq': '', 'json': ''},
+    'overlay': {'style': '', 'left': '', 'top': '', 'width': '', 'height': ''},
+}
+
+
+def slim_components(components, internal_fields=DEFAULT_INTERNAL_FIELDS):
+    """
+    Return a slimmed copy of a component tree; the input is left untouched.
+
+    :param components: Form.io components list
+    :param internal_fields: Component keys to remove at any depth
+    :return: new components list
+    """
+    return [_slim(c, internal_fields) for c in components or () if c.get('key') not in internal_fields]
+
+
+def _slim(component, internal_fields):
+    slim = {}
+    for name, value in component.items():
+        if name in BUILDER_ONLY_PROPERTIES:
+            continue
+        if name in DEFAULT_PROPERTIES and value == DEFAULT_PROPERTIES[name]:
+            continue
+        if name in DEFAULT_NESTED and isinstance(value, dict):
+            defaults = DEFAULT_NESTED[name]
+            value = {k: v for k, v in value.items() if k not in defaults or v != defaults[k]}
+            if not value:
+                continue
+        elif name == 'components':
+            value = slim_components(value, internal_fields)
+        elif name == 'columns' and isinstance(value, list):
+            # Columns components: each column holds a components list
+            value = [dict(column, components=slim_components(column.get('components'), internal_fields))
+                     if isinstance(column, dict) else column for column in value]
+        elif name == 'rows' and isinstance(value, list) and component.get('type') == 'table':
+            # Table components: rows of cells, each cell holding a components list
+            value = [[dict(cell, components=slim_components(cell.get('components'), internal_fields))
+                      for cell in row] for row in value]
+        slim[name] = value
+    return slim
+
+
+def script_safe_json(value):
+    """
+    Serialize ``value`` as minified JSON that can be embedded in HTML/<script>.
+
+    Same escaping as Jinja's ``tojson`` filter.
+
+    :return: Markup
+    """
+    text = json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+    text = text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026').replace("'", '\\u0027')
+    return Markup(text)
+
+
+class CompiledForm:
+    """A form version prepared for rendering, with its serializations computed once."""
+
+    def __init__(self, form, internal_fields):
+        """
+        :param form: CachedForm
+        :param internal_fields: Component keys to remove at any depth
+        """
+        self.path = form.path
+        self.modified = form.modified
+        self.title = form.data.get('title')
+        self.components = slim_components(form.data.get('components'), internal_fields)
+        # Embedded in forms-form.jinja2 and handed to Formio.createForm
+        self.script = script_safe_json({'components': self.components})
+        self._meta = {k: v for k, v in form.data.items() if k != 'components'}
+        self._json = {}
+        self._lock = Lock()
+
+    def after_fork(self):
+        self._lock = Lock()
+
+    def data(self, path):
+        """
+        The form=json payload for a form served at ``path``.
+
+        :param path: Form URL, reported back as 'path'
+        :return: dict sharing the compiled components; don't modify it
+        """
+        return dict(self._meta, components=self.components, path=path)
+
+    def json(self, path):
+        """
+        The form=json body for a request path, serialized once per path.
+
+        :param path: Request path, reported back as 'path'
+        :return: (body bytes, etag, compressed variants cache)
+        """
+        cached = self._json.get(path)
+        if cached is None:
+            body = json.dumps(self.data(path), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            cached = (body, make_etag('form', self.path, self.modified, path), {})
+            with self._lock:
+                self._json.setdefault(path, cached)
+        return cached
+
+
+class SchemaCompiler:
+    """Compiles each form version once and keeps the most recent ones."""
+
+    def __init__(self, internal_fields=DEFAULT_INTERNAL_FIELDS, maxsize=128):
+        """
+        :param internal_fields: Component keys to remove at any depth
+        :param maxsize: Compiled form versions kept
+        """
+        self.internal_fields = frozenset(internal_fields)
+        self._compiled = LRUCache(maxsize)
+
+        # Counters
+        self.hits = 0
+        self.compiles = 0
+        self._counter_lock = Lock()
+
+    def after_fork(self):
+        """Replace every lock, including those of the compiled forms, in a forked child."""
+        self._counter_lock = Lock()
+        self._compiled.after_fork()
+        for compiled in self._compiled.values():
+            compiled.after_fork()
+
+    def compile(self, form):
+        """
+        Return the compiled version of a cached form.
+
+        :param form: CachedForm
+        :return: CompiledForm
+        """
+        # Unversioned forms are compiled per cached copy
+        key = (form.path, form.modified or id(form.data))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = CompiledForm(form, self.internal_fields)
+            self._compiled.set(key, compiled)
+            with self._counter_lock:
+                self.compiles += 1
+        else:
+            with self._counter_lock:
+                self.hits += 1
+        return compiled
+
+    def stats(self):
+        """
+        Snapshot of the compiler counters.
+
+        :return: dict of counter name to value
+        """
+        return {
+            'size': len(self._compiled),
+            'hits': self.hits,
+            'compiles': self.compiles,
+        }
@@ -0,0 +1,262 @@
+"""
+Shared state for multi-process deployments.
+
+Every gunicorn worker keeps its own FormioAPI, token and caches. With
+``FORMS_SHARED_STATE`` set to 'sqlite' (single host, no extra services) or
+'redis', workers publish the machine JWT, form schemas and the form catalog
+to a common store and adopt each other's copies instead of each going to
+Form.io. Invalidation is propagated through generation counters that every
+worker polls at most once per second.
+
+``python -m app.forms.shared invalidate [schemas|catalog|permissions|token]``
+(from the client directory, with the app's FORMS_SHARED_STATE* environment)
+invalidates state in every worker, e.g. after editing permissions in Form.io.
+"""
+# Standard library imports
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from threading import Lock, local
+
+# Namespaces with a generation counter
+NAMESPACES = ('schemas', 'catalog', 'permissions', 'token')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+);
+"""
+
+
+class SQLiteStore:
+    """
+    Key/value store in a SQLite file shared by the workers of one host.
+
+    Values are JSON. Backend errors are counted and degrade to cache misses,
+    so a broken store never fails a request.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: SQLite database file
+        """
+        self.path = path
+        self.errors = 0
+        self._local = local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Short-lived connection: nothing is left open to be inherited by forked workers
+        db = sqlite3.connect(path, timeout=10, isolation_level=None)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+    def _connection(self):
+        db = getattr(self._local, 'db', None)
+        if db is None or getattr(self._local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        try:
+            self._connection().execute('INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)',
+                                       (key, json.dumps(value), expires_at))
+        except sqlite3.Error:
+            self.errors += 1
+
+    def add(self, key, value, ttl):
+        """Set ``key`` only if it is absent or expired; return whether it was set (a cross-process lock)."""
+        now = time.time()
+        try:
+            cursor = self._connection().execute(
+                'INSERT INTO state (key, value, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at '
+                'WHERE state.expires_at IS NOT NULL AND state.expires_at <= ?',
+                (key, json.dumps(value), now + ttl, now))
+        except sqlite3.Error:
+            self.errors += 1
+            return True  # Degrade to uncoordinated, never to stuck
+        return cursor.rowcount == 1
+
+    def delete(self, key):
+        try:
+            self._connection().execute('DELETE FROM state WHERE key = ?', (key,))
+        except sqlite3.Error:
+            self.errors += 1
+
+    def incr(self, key):
+        db = self._connection()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                row = db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+                value = (json.loads(row[0]) if row else 0) + 1
+                db.execute('INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, NULL)',
+                           (key, json.dumps(value)))
+                db.execute('COMMIT')
+            except Exception:
+                db.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        # Expired entries are only ever overwritten; drop them while we hold the write lock anyway
+        try:
+            db.execute('DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?', (time.time(),))
+        except sqlite3.Error:
+            pass
+        return value
+
+    def stats(self):
+        return {'errors': self.errors}
+
+
+class RedisStore:
+    """Key/value store in Redis (or a compatible server), for workers spread over several hosts."""
+
+    def __init__(self, url, prefix='insbluemin-forms:'):
+        """
+        :param url: Redis URL, e.g. 'redis://localhost:6379/0'
+        :param prefix: Prefix of every key written
+        """
+        # Optional dependency, only imported by deployments that use it
+        try:
+            import redis
+        except ImportError:  # pragma: no cover - optional dependency
+            raise RuntimeError("FORMS_SHARED_STATE='redis' requires the 'redis' package") from None
+        self._redis = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._redis_error = redis.RedisError
+        self.prefix = prefix
+        self.errors = 0
+
+    def get(self, key):
+        try:
+            value = self._redis.get(self.prefix + key)
+        except self._redis_error:
+            self.errors += 1
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        try:
+            self._redis.set(self.prefix + key, json.dumps(value), ex=math.ceil(ttl) if ttl else None)
+        except self._redis_error:
+            self.errors += 1
+
+    def add(self, key, value, ttl):
+        """Set ``key`` only if it is absent; return whether it was set (a cross-process lock)."""
+        try:
+            return bool(self._redis.set(self.prefix + key, json.dumps(value), ex=math.ceil(ttl), nx=True))
+        except self._redis_error:
+            self.errors += 1
+            return True
+
+    def delete(self, key):
+        try:
+            self._redis.delete(self.prefix + key)
+        except self._redis_error:
+            self.errors += 1
+
+    def incr(self, key):
+        try:
+            return self._redis.incr(self.prefix + key)
+        except self._redis_error:
+            self.errors += 1
+            return None
+
+    def stats(self):
+        return {'errors': self.errors}
+
+
+class Generation:
+    """
+    Cross-process invalidation counter.
+
+    ``bump()`` advances the counter in the shared store; ``changed()`` polls
+    it at most once per ``interval`` seconds and reports whether another
+    worker bumped it since the last call.
+    """
+
+    def __init__(self, store, name, interval=1.0):
+        """
+        :param store: Shared store
+        :param name: Namespace, one of NAMESPACES
+        :param interval: Minimum seconds between polls of the store
+        """
+        self._store = store
+        self._key = f"generation:{name}"
+        self.interval = interval
+        self.value = store.get(self._key) or 0
+        self._checked_at = time.time()
+        self._lock = Lock()
+
+    def changed(self):
+        now = time.time()
+        if now - self._checked_at < self.interval:
+            return False
+        with self._lock:
+            if now - self._checked_at < self.interval:
+                return False
+            self._checked_at = now
+            current = self._store.get(self._key) or 0
+            if current == self.value:
+                return False
+            self.value = current
+            return True
+
+    def after_fork(self):
+        self._lock = Lock()
+
+    def bump(self):
+        value = self._store.incr(self._key)
+        if value is not None:
+            with self._lock:
+                self.value = value
+
+
+def build_store(config, instance_path=''):
+    """
+    Build the shared-state store selected by FORMS_SHARED_STATE.
+
+    :param config: Flask config mapping (or os.environ)
+    :param instance_path: Directory for the default SQLite file
+    :return: SQLiteStore, RedisStore, or None for process-local state ('memory', the default)
+    """
+    backend = config.get('FORMS_SHARED_STATE') or 'memory'
+    url = config.get('FORMS_SHARED_STATE_URL') or ''
+    if backend == 'memory':
+        return None
+    if backend == 'sqlite':
+        return SQLiteStore(url or os.path.join(instance_path, 'forms-state.sqlite3'))
+    if backend == 'redis':
+        return RedisStore(url or 'redis://localhost:6379/0')
+    raise ValueError(f"Unknown FORMS_SHARED_STATE backend: {backend}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'invalidate' or not set(sys.argv[2:]) <= set(NAMESPACES):
+        sys.exit(f"usage: python -m app.forms.shared invalidate [{'|'.join(NAMESPACES)} ...]")
+    store = build_store(os.environ, instance_path=os.path.join(os.getcwd(), 'instance'))
+    if store is None:
+        sys.exit("FORMS_SHARED_STATE is 'memory': state is per process, restart the workers instead")
+    for namespace in sys.argv[2:] or NAMESPACES:
+        print(f"{namespace}: generation {store.incr(f'generation:{namespace}')}")
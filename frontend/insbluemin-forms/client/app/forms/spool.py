@@ -0,0 +1,319 @@
+"""
+Write-behind delivery of form submissions.
+
+With ``FORMS_SUBMIT_MODE = 'spool'`` a submission is committed to a local
+SQLite spool and acknowledged with 202; a background thread in every worker
+process delivers spooled submissions to Form.io. Workers coordinate through
+the database: a submission is claimed with a short lease inside an
+``IMMEDIATE`` transaction, and only the oldest pending submission of each
+form is ever claimable, so submissions to one form reach Form.io in the
+order they were accepted. Delivery is at-least-once: a worker dying between
+the upstream POST and marking the row delivered causes a redelivery after
+the lease expires.
+"""
+# Standard library imports
+import json
+import os
+import random
+import sqlite3
+import time
+from threading import Event, Lock, Thread, local
+
+from .cache import LRUCache
+from .metrics import SPOOL_DELIVERY_LAG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    form_path TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL,
+    delivered_at REAL,
+    submission_id TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS spool_pending ON spool (status, form_path, id);
+"""
+
+PENDING = 'pending'
+DELIVERED = 'delivered'
+FAILED = 'failed'
+
+# Upstream statuses that are worth retrying; any other 4xx is a permanent rejection
+RETRYABLE_STATUSES = frozenset((401, 408, 429))
+
+
+def idempotency_scope(user, form_path, key):
+    """
+    Scope a client-supplied idempotency key to one user and form.
+
+    :return: scoped key, or None when the client sent no key
+    """
+    if not key:
+        return None
+    return f"{user}\x1f{form_path}\x1f{key[:200]}"
+
+
+class SubmissionSpool:
+    """
+    Durable, SQLite-backed queue of submissions waiting for Form.io.
+    """
+
+    def __init__(self, path, deliver, runner=None, max_attempts=10, min_backoff=1, max_backoff=300,
+                 lease=60, retention=86400, poll_interval=5, start=True):
+        """
+        Open (creating if needed) the spool and start the delivery thread.
+
+        :param path: SQLite database file, shared by every worker process
+        :param deliver: Callable ``deliver(form_path, payload)`` returning
+                        ``(status_code, body)``; raises on transport errors
+        :param runner: Optional callable wrapping each delivery (e.g. to push an app context)
+        :param max_attempts: Deliveries tried before a submission is marked failed
+        :param min_backoff: First retry delay, in seconds
+        :param max_backoff: Upper bound on the retry delay, in seconds
+        :param lease: Seconds a claimed submission is reserved for one worker
+        :param retention: Seconds delivered submissions (and their idempotency keys) are kept
+        :param poll_interval: Seconds between scans for work enqueued by other processes
+        :param start: Start delivering now; a preloading gunicorn master passes False
+                      and its forked workers start in after_fork()
+        """
+        self.path = path
+        self._deliver = deliver
+        self._runner = runner or (lambda fn, *args: fn(*args))
+        self.max_attempts = max_attempts
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.retention = retention
+        self.poll_interval = poll_interval
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = local()
+        # Short-lived connection: nothing is left open to be inherited by forked workers
+        db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        try:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+        finally:
+            db.close()
+
+        self._wakeup = Event()
+        self._thread = None
+        self._thread_lock = Lock()
+
+        # Metrics (this process only)
+        self.delivered = 0
+        self.retries = 0
+        self.rejected = 0
+        self.last_delivery_lag = None
+        if start:
+            self._ensure_thread()
+
+    def enqueue(self, form_path, payload, key=None):
+        """
+        Durably accept a submission for later delivery.
+
+        :param form_path: Path of the form the submission belongs to
+        :param payload: JSON-serializable submission body
+        :param key: Scoped idempotency key (see idempotency_scope), or None
+        :return: (spool id, True) for a new submission, or (existing id, False) for a replay
+        """
+        now = time.time()
+        db = self._connection()
+        try:
+            with db:
+                cursor = db.execute(
+                    'INSERT INTO spool (form_path, idempotency_key, payload, created_at, next_attempt_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (form_path, key, json.dumps(payload), now, now))
+        except sqlite3.IntegrityError:
+            row = db.execute('SELECT id FROM spool WHERE idempotency_key = ?', (key,)).fetchone()
+            return row[0], False
+
+        self._ensure_thread()
+        self._wakeup.set()
+        return cursor.lastrowid, True
+
+    def stats(self):
+        """
+        Snapshot of the spool: queue depth and lag are read from the shared database.
+
+        :return: dict of counter name to value
+        """
+        now = time.time()
+        depth, oldest = self._connection().execute(
+            'SELECT COUNT(*), MIN(created_at) FROM spool WHERE status = ?', (PENDING,)).fetchone()
+        failed = self._connection().execute(
+            'SELECT COUNT(*) FROM spool WHERE status = ?', (FAILED,)).fetchone()[0]
+        return {
+            'depth': depth,
+            'failed': failed,
+            'oldest_pending_age': now - oldest if oldest is not None else 0,
+            'delivered': self.delivered,
+            'retries': self.retries,
+            'rejected': self.rejected,
+            'last_delivery_lag': self.last_delivery_lag,
+        }
+
+    def after_fork(self):
+        """Open new connections and start delivering in a forked child."""
+        self._local = local()
+        self._wakeup = Event()
+        self._thread = None
+        self._thread_lock = Lock()
+        self._ensure_thread()
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute('PRAGMA busy_timeout = 30000')
+            self._local.db = db
+        return db
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name='forms-spool-delivery', daemon=True)
+                self._thread.start()
+
+    def _claim(self):
+        """Lease the oldest due submission among the forms with no delivery in flight."""
+        now = time.time()
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(
+                'SELECT s.id, s.form_path, s.payload, s.attempts, s.created_at FROM spool s '
+                'WHERE s.status = ? AND s.id = '
+                '(SELECT MIN(id) FROM spool WHERE status = ? AND form_path = s.form_path) '
+                'AND s.next_attempt_at <= ? AND (s.lease_until IS NULL OR s.lease_until < ?) '
+                'ORDER BY s.id LIMIT 1',
+                (PENDING, PENDING, now, now)).fetchone()
+            if row is not None:
+                db.execute('UPDATE spool SET lease_until = ? WHERE id = ?', (now + self.lease, row[0]))
+            db.execute('COMMIT')
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        return row
+
+    def _attempt(self, spool_id, form_path, payload, attempts, created_at):
+        db = self._connection()
+        try:
+            status_code, body = self._runner(self._deliver, form_path, json.loads(payload))
+        except Exception as e:
+            status_code, body = None, str(e) or e.__class__.__name__
+
+        now = time.time()
+        attempts += 1
+        if status_code is not None and 200 <= status_code < 300:
+            try:
+                submission_id = json.loads(body).get('_id')
+            except (ValueError, AttributeError):
+                submission_id = None
+            with db:
+                db.execute('UPDATE spool SET status = ?, attempts = ?, delivered_at = ?, submission_id = ?, '
+                           'lease_until = NULL, last_error = NULL WHERE id = ?',
+                           (DELIVERED, attempts, now, submission_id, spool_id))
+            self.delivered += 1
+            self.last_delivery_lag = now - created_at
+            SPOOL_DELIVERY_LAG.observe(self.last_delivery_lag)
+            return
+
+        permanent = status_code is not None and status_code < 500 and status_code not in RETRYABLE_STATUSES
+        if permanent or attempts >= self.max_attempts:
+            with db:
+                db.execute('UPDATE spool SET status = ?, attempts = ?, lease_until = NULL, last_error = ? '
+                           'WHERE id = ?', (FAILED, attempts, f"{status_code}: {body}"[:2000], spool_id))
+            self.rejected += 1
+            return
+
+        delay = min(self.min_backoff * 2 ** (attempts - 1), self.max_backoff) * random.uniform(0.5, 1.0)
+        with db:
+            db.execute('UPDATE spool SET attempts = ?, next_attempt_at = ?, lease_until = NULL, last_error = ? '
+                       'WHERE id = ?', (attempts, now + delay, f"{status_code}: {body}"[:2000], spool_id))
+        self.retries += 1
+
+    def _purge(self):
+        with self._connection() as db:
+            db.execute('DELETE FROM spool WHERE status = ? AND delivered_at < ?',
+                       (DELIVERED, time.time() - self.retention))
+
+    def _next_delay(self):
+        row = self._connection().execute(
+            'SELECT MIN(MAX(next_attempt_at, COALESCE(lease_until, 0))) FROM spool WHERE status = ?',
+            (PENDING,)).fetchone()
+        if row[0] is None:
+            return self.poll_interval
+        return min(max(row[0] - time.time(), 0), self.poll_interval)
+
+    def _run(self):
+        last_purge = 0
+        while True:
+            try:
+                # One submission per claim, so a lease never outlives its delivery attempt
+                row = self._claim()
+                if row is not None:
+                    self._attempt(*row)
+                if time.time() - last_purge > 60:
+                    self._purge()
+                    last_purge = time.time()
+                delay = 0 if row is not None else self._next_delay()
+            except sqlite3.Error:
+                delay = self.poll_interval
+            if delay:
+                self._wakeup.wait(delay)
+                self._wakeup.clear()
+
+
+class IdempotencyCache:
+    """
+    In-process replay protection for synchronous submissions.
+
+    Completed responses are remembered per scoped key; a duplicate that
+    arrives while the first request is still in flight is refused.
+    """
+
+    def __init__(self, maxsize=1024):
+        self._done = LRUCache(maxsize)
+        self._in_flight = set()
+        self._lock = Lock()
+
+    def after_fork(self):
+        """Forget the parent's in-flight keys and replace the locks in a forked child."""
+        self._lock = Lock()
+        self._in_flight = set()
+        self._done.after_fork()
+
+    def begin(self, key):
+        """
+        Start handling ``key``.
+
+        :return: (True, None) to proceed, (False, cached result) for a completed
+                 replay, or (False, None) while another request holds the key
+        """
+        with self._lock:
+            result = self._done.get(key)
+            if result is not None:
+                return False, result
+            if key in self._in_flight:
+                return False, None
+            self._in_flight.add(key)
+            return True, None
+
+    def finish(self, key, result=None):
+        """Release ``key``, remembering ``result`` (a successful response) for replays."""
+        with self._lock:
+            self._in_flight.discard(key)
+            if result is not None:
+                self._done.set(key, result)
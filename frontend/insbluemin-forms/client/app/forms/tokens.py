@@ -0,0 +1,234 @@
+# Standard library imports
+import os
+import random
+import time
+from threading import Event, Lock, Thread
+
+from .shared import Generation
+
+# Shared-store keys (see shared.py)
+TOKEN_KEY = 'token'
+LOGIN_LOCK_KEY = 'token:login'
+
+# Seconds a worker may hold the cross-process login lock
+LOGIN_LOCK_TTL = 10
+
+
+class TokenManager:
+    """
+    Keeps a Form.io machine JWT fresh without blocking request threads.
+
+    A daemon thread renews the token ``refresh_margin`` seconds before its
+    ``exp`` (at most half-way through its lifetime, for tokens shorter-lived
+    than that) while the current token keeps being served; renewals are at
+    least ``min_backoff`` seconds apart. Only a cold start
+    (no valid token at all) makes a caller wait, and concurrent callers share
+    that single login. Failed logins are retried with jittered exponential
+    backoff; during a backoff window callers fail fast instead of queueing.
+
+    With a shared store, workers publish the token they obtain and adopt a
+    published one before logging in themselves, and only one worker at a
+    time performs the login.
+    """
+
+    def __init__(self, login, refresh_margin=300, min_backoff=1, max_backoff=60, runner=None, store=None):
+        """
+        Initialize the manager.
+
+        :param login: Callable returning ``(token, exp)``; raises on failure
+        :param refresh_margin: Seconds before expiry at which the token is renewed, capped at half its lifetime
+        :param min_backoff: First retry delay after a failed login, in seconds
+        :param max_backoff: Upper bound on the retry delay, in seconds
+        :param runner: Optional callable wrapping the login (e.g. to push an app context)
+        :param store: Optional shared store (see shared.build_store)
+        """
+        self._login = login
+        self.refresh_margin = refresh_margin
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._runner = runner or (lambda fn, *args: fn(*args))
+        self._store = store
+        self._generation = Generation(store, 'token') if store is not None else None
+
+        self._token = None
+        self._expiry = 0
+        self._issued_at = 0
+        self._retry_at = 0
+        self._backoff = 0
+
+        self._login_lock = Lock()  # Single-flight for logins
+        self._wakeup = Event()
+        self._thread = None
+        self._thread_lock = Lock()
+
+        # Metrics
+        self.refreshes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_latency = None
+        self.adopted = 0
+
+    def get(self):
+        """
+        Return a valid token, or None if none can be obtained right now.
+
+        :return: JWT string or None
+        """
+        self._ensure_thread()
+        if self._generation is not None and self._generation.changed():
+            self._drop()
+        if self._valid():
+            return self._token
+
+        # Cold start or expired token: one caller logs in, the others wait for it
+        with self._login_lock:
+            if self._valid():
+                return self._token
+            if time.time() < self._retry_at:
+                return None
+            self._refresh()
+        # Let the refresh thread reschedule around the new expiry
+        self._wakeup.set()
+        return self._token if self._valid() else None
+
+    def invalidate(self):
+        """Drop the current token (e.g. after Form.io rejected it) and renew it in the background."""
+        if self._store is not None:
+            shared = self._store.get(TOKEN_KEY)
+            if shared and shared.get('token') == self._token:
+                # Don't let other workers adopt the rejected token
+                self._store.delete(TOKEN_KEY)
+        self._drop()
+
+    def after_fork(self):
+        """Keep the inherited token, but not the parent's refresh thread or locks."""
+        self._login_lock = Lock()
+        if self._generation is not None:
+            self._generation.after_fork()
+        self._wakeup = Event()
+        self._thread = None
+        self._thread_lock = Lock()
+
+    def _drop(self):
+        self._token = None
+        self._expiry = 0
+        self._wakeup.set()
+
+    def stats(self):
+        """
+        Snapshot of the token metrics.
+
+        :return: dict with token age, seconds to expiry, refresh counts and last latency
+        """
+        now = time.time()
+        return {
+            'token_age': now - self._issued_at if self._token else None,
+            'expires_in': self._expiry - now if self._token else None,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_refresh_latency': self.last_latency,
+            'adopted': self.adopted,
+        }
+
+    def _margin(self, issued_at, expiry):
+        # A margin as long as the token's lifetime would renew it as soon as it is issued
+        return min(self.refresh_margin, max(expiry - issued_at, 0) / 2)
+
+    def _due(self):
+        # Renewal is due inside the margin, but never sooner than min_backoff after the last one
+        now = time.time()
+        if self._token is None:
+            return True
+        return now + self._margin(self._issued_at, self._expiry) >= self._expiry and \
+            now >= self._issued_at + self.min_backoff
+
+    def _valid(self):
+        # A token is usable until a few seconds before it actually expires
+        return self._token is not None and time.time() + 5 < self._expiry
+
+    def _refresh(self):
+        started = time.time()
+        try:
+            token, expiry = self._obtain()
+        except Exception:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self._backoff = min(max(self._backoff * 2, self.min_backoff), self.max_backoff)
+            self._retry_at = time.time() + self._backoff * random.uniform(0.5, 1.0)
+            return False
+        finally:
+            self.last_latency = time.time() - started
+
+        self._token, self._expiry, self._issued_at = token, expiry, time.time()
+        self._backoff = 0
+        self._retry_at = 0
+        self.consecutive_failures = 0
+        self.refreshes += 1
+        return True
+
+    def _obtain(self):
+        """Adopt a token another worker published, or log in (publishing the new token)."""
+        if self._store is None:
+            return self._runner(self._login)
+
+        shared = self._adoptable()
+        if shared:
+            return shared
+        if not self._store.add(LOGIN_LOCK_KEY, os.getpid(), ttl=LOGIN_LOCK_TTL):
+            # Another worker is logging in: wait for its token rather than logging in too
+            deadline = time.time() + LOGIN_LOCK_TTL
+            while time.time() < deadline:
+                time.sleep(0.1)
+                shared = self._adoptable()
+                if shared:
+                    return shared
+        try:
+            token, expiry = self._runner(self._login)
+            self._store.set(TOKEN_KEY, {'token': token, 'exp': expiry, 'iat': time.time()},
+                            ttl=max(expiry - time.time(), 1))
+            return token, expiry
+        finally:
+            self._store.delete(LOGIN_LOCK_KEY)
+
+    def _adoptable(self):
+        # A published token is only worth adopting if it is not itself due for renewal
+        shared = self._store.get(TOKEN_KEY)
+        if not shared or shared.get('token') == self._token:
+            return None
+        margin = self._margin(shared.get('iat', shared['exp'] - 2 * self.refresh_margin), shared['exp'])
+        if time.time() + margin < shared['exp']:
+            self.adopted += 1
+            return shared['token'], shared['exp']
+        return None
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name='formio-token-refresh', daemon=True)
+                self._thread.start()
+
+    def _next_delay(self):
+        now = time.time()
+        if self._retry_at > now:
+            return self._retry_at - now
+        if self._token is None:
+            # Nothing to refresh until a caller has logged in once
+            return None if not self.failures else 0
+        due_at = max(self._expiry - self._margin(self._issued_at, self._expiry), self._issued_at + self.min_backoff)
+        return max(due_at - now, 0)
+
+    def _run(self):
+        while True:
+            delay = self._next_delay()
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+            if self._token is None and not self.failures and not self.refreshes:
+                continue
+            if self._due():
+                with self._login_lock:
+                    if self._due():
+                        if time.time() >= self._retry_at:
+                            self._refresh()
@@ -0,0 +1,181 @@
+# Standard library imports
+import time
+from threading import Lock, local
+
+# Third-party imports
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Only requests that are safe to replay are retried after reaching the server
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Upstream statuses worth retrying / counting against the circuit breaker
+RETRY_STATUSES = (502, 503, 504)
+
+
+class PooledSession:
+    """
+    Per-thread requests.Session objects sharing one connection pool.
+
+    urllib3's pool behind the HTTPAdapter is thread-safe, but a Session's own
+    state (cookies, hooks, redirect handling) is not documented to be. Each
+    request thread gets its own Session mounted on the shared adapter, so
+    connections are reused across threads without sharing Session state.
+    """
+
+    def __init__(self, adapter):
+        """
+        :param adapter: HTTPAdapter owning the connection pool
+        """
+        self.adapter = adapter
+        self._local = local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the calling thread's Session (see requests.Session.request)."""
+        return self._session().request(method=method, url=url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.adapter.close()
+
+    def after_fork(self):
+        """
+        Start over with an empty pool in a forked child.
+
+        Sockets inherited from the parent are abandoned, not closed: the
+        parent may still be using them.
+        """
+        adapter = self.adapter
+        adapter.init_poolmanager(adapter._pool_connections, adapter._pool_maxsize, block=adapter._pool_block)
+        adapter.proxy_manager = {}
+        self._local = local()
+
+
+def build_session(pool_maxsize=10, retries=2, backoff_factor=0.3, backoff_jitter=0.2):
+    """
+    Create a pooled, thread-safe session for talking to Form.io.
+
+    Connection errors are retried for every method (nothing reached the
+    server); read errors and 502/503/504 answers only for idempotent methods.
+
+    :param pool_maxsize: Connections kept per host; size it to the worker's thread count
+    :param retries: Maximum number of retries per request
+    :param backoff_factor: Base of the exponential backoff between retries, in seconds
+    :param backoff_jitter: Random extra delay added to each backoff, in seconds
+    :return: PooledSession
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        allowed_methods=IDEMPOTENT_METHODS,
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    return PooledSession(adapter)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream service is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``recovery_timeout`` seconds. Then a single trial
+    call is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param recovery_timeout: Seconds to wait before letting a trial call through
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._trial_in_flight = False
+        self._lock = Lock()
+
+        # Counters
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self):
+        """
+        Decide whether a call may go upstream now.
+
+        :return: True if the call may proceed
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def after_fork(self):
+        """Replace the lock in a forked child; a trial call of the parent never completes here."""
+        self._lock = Lock()
+        self._trial_in_flight = False
+
+    def record_success(self):
+        """Register a healthy upstream answer."""
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        """Register a failed upstream call (connection error, timeout or 5xx)."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.time()
+
+    def stats(self):
+        """
+        Snapshot of the breaker state.
+
+        :return: dict with state, consecutive failures and counters
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self._failures,
+                'rejected': self.rejected,
+                'opened': self.opened,
+            }
@@ -1,21 +1,88 @@
 # Standard library imports
+import copy
+import hmac
 import json
+import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from threading import Lock
+from threading import Lock, Thread
 from urllib.parse import urljoin
 
 # Third-party imports
 import jwt
 import requests
-from flask import current_app
-from hashids import Hashids
+from flask import Response, current_app, stream_with_context
+from werkzeug.exceptions import HTTPException
 
 # Local application imports
 from insbluemin.core.auth_manager import current_user
 from insbluemin.core.decorators import *
 from insbluemin.core.views import BaseView
 
+from .cache import SchemaCache
+from .assets import asset_url
+from .catalog import FormCatalog
+from .codec import build_codec
+from .export import columnar, csv_lines, ndjson_lines, prefetched, schema_columns, table_columns
+from .filters import submission_query
+from .metrics import REGISTRY, UPSTREAM_BYTES, UPSTREAM_RESPONSES, UPSTREAM_SECONDS, instrumented, phase
+from .paging import SORT_PATTERN, Page, parse_content_range
+from .permissions import PermissionEngine, action_suffixes, parse_required_actions
+from .responses import bytes_response, json_response, make_etag, not_modified
+from .schema import DEFAULT_INTERNAL_FIELDS, SchemaCompiler
+from .shared import build_store
+from .spool import IdempotencyCache, SubmissionSpool, idempotency_scope
+from .tokens import TokenManager
+from .transport import CircuitBreaker, CircuitOpenError, build_session
+from .warmup import STARTUP, warm_up
+
+# Fields selected when caching a form definition
+FORM_SCHEMA_FIELDS = 'title,name,path,tags,components,modified'
+
+# Descriptions sent to the browser in place of upstream error bodies, which are only logged
+UPSTREAM_ERRORS = {
+    400: "The request was rejected",
+    403: "You do not have permission to do that!",
+    404: "Not found",
+    502: "Upstream service error",
+}
+
+
+def config_list(config, name):
+    """
+    Read a comma-separated setting as a list.
+
+    :param config: Flask config mapping
+    :param name: Setting name
+    :return: list of non-empty, stripped items
+    """
+    return [item.strip() for item in (config.get(name) or '').split(',') if item.strip()]
+
+
+def validation_details(resp):
+    """
+    Reduce a Form.io validation error to the field errors the form can display.
+
+    Only each detail's message and field path are kept; everything else in
+    the upstream body (context, stack, internal names) is dropped.
+
+    :param resp: requests.Response with status 400
+    :return: list of {'message', 'path'} dicts, empty if the body is not a validation error
+    """
+    try:
+        body = resp.json()
+    except ValueError:
+        return []
+    if not isinstance(body, dict) or body.get('name') != 'ValidationError':
+        return []
+    details = []
+    for detail in body.get('details') or ():
+        if isinstance(detail, dict) and isinstance(detail.get('message'), str):
+            path = [part for part in detail.get('path') or () if isinstance(part, (str, int))]
+            details.append({'message': detail['message'], 'path': path})
+    return details
+
 
 class FormioAPI:
     """
@@ -23,7 +90,10 @@ class FormioAPI:
     token caching, and permission enforcement on form requests.
     """
 
-    def __init__(self, api_url, api_key, api_secret, timeout=5):
+    def __init__(self, api_url, api_key, api_secret, timeout=5, app=None,
+                 schema_cache_size=128, schema_cache_ttl=300, schema_cache_stale_ttl=3600,
+                 token_refresh_margin=300, pool_maxsize=10, retries=2, backoff_factor=0.3,
+                 breaker_threshold=5, breaker_recovery=30, store=None):
         """
         Initialize FormioAPI with connection parameters.
 
@@ -31,19 +101,73 @@ class FormioAPI:
         :param api_key: API key for machine login
         :param api_secret: API secret for machine login
         :param timeout: HTTP request timeout in seconds
+        :param app: Flask application, used to run background work in an app context
+        :param schema_cache_size: Maximum number of form schemas kept in memory
+        :param schema_cache_ttl: Seconds a cached schema is served without revalidation
+        :param schema_cache_stale_ttl: Extra seconds a stale schema is served while refreshing
+        :param token_refresh_margin: Seconds before expiry at which the machine token is renewed
+        :param pool_maxsize: Pooled connections to Form.io (size to the worker's thread count)
+        :param retries: Retries for idempotent requests, with jittered exponential backoff
+        :param backoff_factor: Base backoff between retries, in seconds
+        :param breaker_threshold: Consecutive upstream failures that open the circuit breaker
+        :param breaker_recovery: Seconds the circuit stays open before a trial request
+        :param store: Optional store sharing the token, schemas and invalidations between workers
         """
         self.api_url = api_url.rstrip('/')  # Ensure no trailing slash
         self.api_key = api_key
         self.api_secret = api_secret
         self.timeout = timeout
 
-        # Create a single session to reuse TCP connections
-        self._session = requests.Session()
+        # Create a single pooled session to reuse TCP connections
+        self._session = build_session(pool_maxsize=pool_maxsize, retries=retries, backoff_factor=backoff_factor)
+        # Fail fast with a 503 while Form.io is unhealthy
+        self.breaker = CircuitBreaker(failure_threshold=breaker_threshold, recovery_timeout=breaker_recovery)
+
+        self._app = app
+        # Machine token, renewed in the background before it expires
+        self.tokens = TokenManager(
+            login=self._machine_login,
+            refresh_margin=token_refresh_margin,
+            runner=self._in_app_context,
+            store=store
+        )
+        # Precompiled permission checks shared by all requests
+        self.permissions = PermissionEngine(store=store)
+        # Form schema cache, revalidated against the form's 'modified' timestamp
+        self.schemas = SchemaCache(
+            loader=self._load_form,
+            revalidator=self._form_modified,
+            maxsize=schema_cache_size,
+            ttl=schema_cache_ttl,
+            stale_ttl=schema_cache_stale_ttl,
+            runner=self._in_app_context,
+            store=store
+        )
+        # Identical GETs in flight share one upstream call
+        self._inflight = {}
+        self._inflight_lock = Lock()
+        self.coalesced = 0
+
+    def after_fork(self):
+        """Give a forked worker its own connections, locks, background threads and in-flight table."""
+        self._session.after_fork()
+        self.breaker.after_fork()
+        self.tokens.after_fork()
+        self.permissions.after_fork()
+        self.schemas.after_fork()
+        self._inflight = {}
+        self._inflight_lock = Lock()
+
+    def stats(self):
+        """
+        Snapshot of the request coalescing counters.
 
-        # Token cache variables
-        self._token = None
-        self._token_expiry = 0
-        self._lock = Lock()  # Thread-safety for token refresh
+        :return: dict of counter name to value
+        """
+        return {
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+        }
 
     @staticmethod
     def check_form_permission(user_permissions, form_tags):
@@ -54,72 +178,131 @@ class FormioAPI:
         :param form_tags: List of tags from the form metadata
         :return: True if form is public or user has required permission, False otherwise
         """
-        form_tags = form_tags or []
-        # Extract required actions from tags prefixed with 'perm:'
-        required_actions = [tag.split(':')[1] for tag in form_tags if tag.startswith('perm:')]
+        required_actions = parse_required_actions(form_tags)
+        return PermissionEngine.allows(action_suffixes(user_permissions), required_actions)
 
-        # Public form if no permissions required
-        if not required_actions:
-            return True
+    def _get_token(self):
+        """
+        Return the cached JWT token for Form.io machine authentication.
 
-        # Grant if any user permission ends with required action
-        for action in required_actions:
-            if any(p.endswith(f".{action}") for p in user_permissions):
-                return True
+        The token is renewed by a background thread well before it expires,
+        so request threads only wait on a login at cold start.
 
-        return False
+        :return: JWT token string or None on failure
+        """
+        with phase('token'):
+            return self.tokens.get()
 
-    def _get_token(self):
+    def _machine_login(self):
         """
-        Retrieve and cache a JWT token for Form.io machine authentication.
-        Automatically refreshes token if near expiration.
+        Perform a Form.io machine login.
 
-        :return: JWT token string or None on failure
+        :raises: requests.RequestException or ValueError on failure
+        :return: tuple (token, exp)
         """
-        now = time.time()
-        with self._lock:
-            # Reuse valid token if expiry is at least 30 seconds away
-            if self._token and now + 30 < self._token_expiry:
-                return self._token
-
-            payload = {
-                "data": {
-                    "api_key": self.api_key,
-                    "api_secret": self.api_secret
-                }
+        payload = {
+            "data": {
+                "api_key": self.api_key,
+                "api_secret": self.api_secret
             }
-            try:
-                # Perform machine login to retrieve JWT header
-                resp = self._session.post(
-                    urljoin(self.api_url + '/', 'machine/login'),
-                    json=payload,
-                    timeout=self.timeout
-                )
-                current_app.logger.debug(resp.json())  # Log full response JSON for debugging
-                resp.raise_for_status()
-            except requests.RequestException as e:
-                current_app.logger.error(f"Formio login failed: {e}")
-                return None
-
-            token = resp.headers.get('X-Jwt-Token')
-            if not token:
-                current_app.logger.error("Token not found in response headers.")
-                return None
+        }
+        try:
+            # Perform machine login to retrieve JWT header
+            resp = self._send('POST', urljoin(self.api_url + '/', 'machine/login'), json=payload)
+            resp.raise_for_status()
+        except (requests.RequestException, CircuitOpenError) as e:
+            current_app.logger.error(f"Formio login failed: {e}")
+            raise
+
+        token = resp.headers.get('X-Jwt-Token')
+        if not token:
+            current_app.logger.error("Token not found in response headers.")
+            raise ValueError("Token not found in response headers")
+
+        try:
+            # Decode payload without verifying signature to get expiry
+            decoded = jwt.decode(token, options={"verify_signature": False})
+            exp = decoded.get('exp')
+            if not exp:
+                raise ValueError("No exp in token")
+        except Exception as e:
+            current_app.logger.error(f"Failed to decode JWT token: {e}")
+            raise ValueError("Invalid token") from e
+
+        current_app.logger.debug("Formio machine login succeeded")
+        return token, exp
+
+    def _send(self, method, url, **kwargs):
+        """
+        Send a request through the pooled session, guarded by the circuit breaker.
+
+        Connection errors, timeouts and 5xx answers count as failures.
+        Identical GETs (same URL, parameters and headers) that are already
+        in flight are not sent again: every caller gets its own copy of the
+        one response, or the same exception.
+
+        :param method: HTTP method name
+        :param url: Absolute URL
+        :raises CircuitOpenError: if the circuit is open
+        :raises requests.RequestException: on transport errors
+        :return: requests.Response
+        """
+        if method.upper() != 'GET':
+            return self._transmit(method, url, **kwargs)
 
+        key = (
+            requests.Request('GET', url, params=kwargs.get('params')).prepare().url,
+            tuple(sorted((kwargs.get('headers') or {}).items()))
+        )
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if leader:
             try:
-                # Decode payload without verifying signature to get expiry
-                decoded = jwt.decode(token, options={"verify_signature": False})
-                exp = decoded.get('exp')
-                if not exp:
-                    raise ValueError("No exp in token")
-            except Exception as e:
-                current_app.logger.error(f"Failed to decode JWT token: {e}")
-                return None
-
-            # Cache token and expiry timestamp
-            self._token = token
-            self._token_expiry = exp
-            return token
+                pending.set_result(self._transmit(method, url, **kwargs))
+            except BaseException as e:
+                pending.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+        else:
+            # Wait for the leader's call, timed as if it were our own
+            with phase('upstream'):
+                pending.exception()
+        # Callers may rewrite the body (permission filtering): nobody gets the shared object
+        return copy.copy(pending.result())
+
+    def _transmit(self, method, url, **kwargs):
+        """Body of _send: one request through the breaker and the pooled session."""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Formio circuit open, refusing {method} {url}")
+
+        kwargs.setdefault('timeout', self.timeout)
+        started = time.perf_counter()
+        try:
+            with phase('upstream'):
+                resp = self._session.request(method=method, url=url, **kwargs)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            UPSTREAM_RESPONSES.inc(method=method, status='error')
+            raise
+        finally:
+            UPSTREAM_SECONDS.observe(time.perf_counter() - started, method=method)
+
+        UPSTREAM_RESPONSES.inc(method=method, status=resp.status_code)
+        UPSTREAM_BYTES.observe(len(resp.content), method=method)
+
+        if resp.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return resp
 
     def _build_headers(self):
         """
@@ -130,6 +313,8 @@ class FormioAPI:
         """
         token = self._get_token()
         if not token:
+            if self.breaker.state != CircuitBreaker.CLOSED:
+                abort(503, description="Form.io is temporarily unavailable")
             abort(401, description="Authentication with Formio failed")
         return {
             'X-Jwt-Token': token
@@ -144,41 +329,107 @@ class FormioAPI:
         :param user_permissions: List of current user's permissions
         :return: original or modified response, or Flask error response
         """
+        with phase('permissions'):
+            return self._filter_response(response, form_id, user_permissions)
 
+    def _filter_response(self, response, form_id, user_permissions):
+        """Body of _enforce_permissions, timed as the 'permissions' phase."""
         try:
             json_data = response.json()
-            # If the response is a list of forms, filter each by permission
-            if isinstance(json_data, list):
-                filtered = []
-                for form in json_data:
-                    tags = form.get('tags')
-                    if tags:
-                        if self.check_form_permission(user_permissions, tags):
-                            filtered.append(form)
-                            # Update internal content for downstream processing
-                        response._content = json.dumps(filtered).encode('utf-8')
-                return response
-
         except ValueError:
             # Non-JSON response
             return jsonify({'message': 'Invalid response from server'}), 500
 
+        # If the response is a list of forms, filter it by permission in one pass
+        if isinstance(json_data, list):
+            if any(item.get('tags') for item in json_data):
+                filtered = self.permissions.filter(user_permissions, json_data)
+                # Update internal content for downstream processing
+                response._content = json.dumps(filtered).encode('utf-8')
+            return response
+
         # Single form permission check if tags are present
         tags = json_data.get('tags')
         if tags is not None:
-            if not self.check_form_permission(user_permissions, tags):
+            if not self.permissions.check(user_permissions, json_data):
+                return jsonify({'message': 'You do not have permission to do that!'}), 403
+        elif form_id:
+            # Fallback: check against the cached form definition (one decision per form version)
+            form = self.schemas.get(form_id)
+            if not self.permissions.check(user_permissions, form.data):
                 return jsonify({'message': 'You do not have permission to do that!'}), 403
-        else:
-            # Fallback: re-fetch tags if not included
-            form_url = urljoin(self.api_url + '/', form_id)
-            fallback = requests.get(f"{form_url}?select=tags", headers=self._build_headers())
-            if fallback.status_code == 200:
-                tags = fallback.json().get('tags', [])
-                if not self.check_form_permission(user_permissions, tags):
-                    return jsonify({'message': 'You do not have permission to do that!'}), 403
 
         return response
 
+    def _in_app_context(self, fn, *args):
+        """Run ``fn`` inside an application context (used by background threads)."""
+        if self._app is None:
+            return fn(*args)
+        with self._app.app_context():
+            return fn(*args)
+
+    def _fetch(self, path, params=None):
+        """
+        GET a Form.io resource with machine credentials only, without user checks.
+
+        :param path: API path, including any query string
+        :param params: Optional query parameters
+        :raises: aborts with the upstream error mapped to 403/404/502
+        :return: requests.Response with status 200
+        """
+        url = urljoin(self.api_url + '/', path.lstrip('/'))
+        headers = self._build_headers()
+        try:
+            resp = self._send('GET', url, headers=headers, params=params)
+        except CircuitOpenError:
+            abort(503, description="Form.io is temporarily unavailable")
+        except requests.RequestException as e:
+            current_app.logger.error(f"Formio GET to {url} failed: {e}")
+            abort(502, description="Upstream service error")
+
+        if resp.status_code not in [200, 206]:
+            current_app.logger.warning(f"Formio GET to {url} returned {resp.status_code}: {resp.text}")
+            status_code = {401: 403, 403: 403, 404: 404}.get(resp.status_code, 502)
+            abort(status_code, description=UPSTREAM_ERRORS[status_code])
+        return resp
+
+    def _fetch_json(self, path, params=None):
+        """GET a Form.io resource with machine credentials and decode its JSON body."""
+        return self._fetch(path, params=params).json()
+
+    def fetch_page(self, path, page, params=None):
+        """
+        Like get_page, but with machine credentials only and no user permission checks.
+
+        Callers must authorize the user first; this is safe to call from
+        background threads that only have an app context.
+
+        :return: list of items
+        """
+        resp = self._fetch(path, params=dict(params or {}, limit=page.size, skip=page.skip))
+        page.total = parse_content_range(resp.headers.get('Content-Range'))[2]
+        return resp.json()
+
+    def _load_form(self, path):
+        """Fetch the cacheable definition of a form."""
+        return self._fetch_json(f"{path}?select={FORM_SCHEMA_FIELDS}")
+
+    def _form_modified(self, path, modified=None):
+        """Fetch only the 'modified' timestamp of a form, used to revalidate the cache."""
+        return self._fetch_json(f"{path}?select=modified").get('modified')
+
+    def get_form(self, path):
+        """
+        Return a form definition from the schema cache, fetching it on a miss.
+
+        Permissions are not applied here; callers check the cached tags
+        against the current user.
+
+        :param path: Form path
+        :return: CachedForm(path, modified, data)
+        """
+        return self.schemas.get(path)
+
     def _request(self, method, path, form_id=None, json_payload=None, **kwargs):
         """
         Generic HTTP method wrapper: GET, POST, PUT, DELETE.
@@ -202,33 +453,35 @@ class FormioAPI:
 
         try:
             # Execute HTTP request
-            resp = self._session.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=json_payload,
-                timeout=self.timeout,
-                **kwargs
-            )
+            resp = self._send(method, url, headers=headers, json=json_payload, **kwargs)
+        except CircuitOpenError:
+            abort(503, description="Form.io is temporarily unavailable")
         except requests.RequestException as e:
             current_app.logger.error(f"Formio {method} to {url} failed: {e}")
             abort(502, description="Upstream service error")
 
         # Check for basic HTTP error codes
         if resp.status_code not in [200, 201, 206]:
-            current_app.logger.error(f"Error with request: {resp.text}")
+            current_app.logger.warning(f"Formio {method} to {url} returned {resp.status_code}: {resp.text}")
             # abort(403, description=f"{response.text}")
             ## if it returns a 401 here it logs the user out
-            payload = json_payload['data']
-            payload.pop('auth_user_email')
+            payload = (json_payload or {}).get('data', {})
+            payload.pop('auth_user_email', None)
+            # The upstream body is only logged; a rejected submission gets its field errors back
             error_body = {
                 "submit": "error",
                 "class": "is-danger",
-                "message": f"{resp.text}",
+                "message": UPSTREAM_ERRORS.get(resp.status_code, "The request could not be completed"),
                 "data": payload
             }
+            details = validation_details(resp) if resp.status_code == 400 and method.upper() in ('POST', 'PUT') else []
+            if details:
+                error_body['message'] = "Please correct the errors in the form"
+                error_body['details'] = details
             status_code = resp.status_code
             if resp.status_code == 401:
+                # The machine token was rejected: renew it for the next request
+                self.tokens.invalidate()
                 status_code = 403
             return make_response(jsonify(error_body), status_code)
 
@@ -237,6 +490,81 @@ class FormioAPI:
         # Enforce form-level permissions before returning
         return self._enforce_permissions(resp, form_id, current_user.permissions)
 
+    def submit(self, path, payload):
+        """
+        POST a spooled submission with machine credentials only (write-behind delivery).
+
+        The payload already carries the submitter's auth_user_email and the
+        submitter was authorized when it was spooled.
+
+        :param path: Form path
+        :param payload: Submission body
+        :raises: on transport errors, an open circuit or a missing token
+        :return: (status code, response text)
+        """
+        url = urljoin(self.api_url + '/', f"{path}/submission")
+        resp = self._send('POST', url, headers=self._build_headers(), json=payload)
+        if resp.status_code == 401:
+            self.tokens.invalidate()
+        return resp.status_code, resp.text
+
+    def fetch_submission(self, form_path, object_id):
+        """
+        GET one submission with machine credentials only, without user checks.
+
+        Callers must authorize the user first; safe to call from threads that
+        only have an app context.
+
+        :param form_path: Form path
+        :param object_id: Submission ObjectId
+        :raises: aborts with the upstream error mapped to 403/404/502
+        :return: submission dict
+        """
+        return self._fetch_json(f"{form_path}/submission/{object_id}")
+
+    def get_page(self, path, page, form_id=None, params=None):
+        """
+        GET one page of a Form.io listing using its limit/skip parameters.
+
+        :param path: API path of the listing, e.g. '<form>/submission'
+        :param page: Page to fetch; its total is filled from the Content-Range header
+        :param form_id: ID/path for permission checks
+        :param params: Extra query parameters (filters, sort)
+        :return: list of items, or a Flask error response
+        """
+        params = dict(params or {}, limit=page.size, skip=page.skip)
+        resp = self.get(path, form_id=form_id, params=params)
+        if not isinstance(resp, requests.Response):
+            return resp
+        page.total = parse_content_range(resp.headers.get('Content-Range'))[2]
+        return resp.json()
+
+    def iter_pages(self, path, page_size=100, form_id=None, params=None, first=None, raw=False):
+        """
+        Walk a Form.io listing page by page.
+
+        :param path: API path of the listing
+        :param page_size: Items requested per upstream call
+        :param form_id: ID/path for permission checks
+        :param params: Extra query parameters (filters, sort)
+        :param first: Optional (page, items) already fetched by the caller
+        :param raw: Fetch with machine credentials only (see fetch_page)
+        :return: generator of item lists
+        """
+        page, items = first or (Page(1, page_size), None)
+        while True:
+            if items is None and raw:
+                items = self.fetch_page(path, page, params=params)
+            elif items is None:
+                items = self.get_page(path, page, form_id=form_id, params=params)
+                if not isinstance(items, list):
+                    abort(502, description="Upstream service error")
+            if items:
+                yield items
+            if len(items) < page.size or (page.total is not None and page.skip + len(items) >= page.total):
+                return
+            page, items = Page(page.number + 1, page.size, page.total), None
+
     def get(self, path, form_id=None, **kwargs):
         """Perform a GET request on the Form.io API."""
         return self._request('GET', path, form_id, **kwargs)
@@ -267,25 +595,152 @@ class FormsView(BaseView):
         :param app: Flask application instance
         :param menu: Application menu registry
         """
-        print('Loaded Forms module')  # Indicate module load
+        app.logger.info('Loaded Forms module')  # Indicate module load
+        started = time.perf_counter()
         super().__init__(app, menu)
 
+        # Local files (spool, shared state) default to <client>/instance
+        data_dir = os.path.join(app.config.get('APP_DIR') or os.getcwd(), 'instance')
+        # Optional cross-worker store for the token, schemas and catalog
+        self.shared = build_store(app.config, instance_path=data_dir)
+
         # Retrieve configuration values
         self.formio = FormioAPI(
             api_url=app.config.get('FORMIO_API_URL'),
             api_key=app.config.get('FORMIO_API_KEY'),
-            api_secret=app.config.get('FORMIO_API_SECRET')
+            api_secret=app.config.get('FORMIO_API_SECRET'),
+            app=app,
+            schema_cache_size=app.config.get('FORMS_SCHEMA_CACHE_SIZE', 128),
+            schema_cache_ttl=app.config.get('FORMS_SCHEMA_CACHE_TTL', 300),
+            schema_cache_stale_ttl=app.config.get('FORMS_SCHEMA_CACHE_STALE_TTL', 3600),
+            token_refresh_margin=app.config.get('FORMIO_TOKEN_REFRESH_MARGIN', 300),
+            timeout=app.config.get('FORMIO_TIMEOUT', 5),
+            # One connection per request and batch thread, plus headroom for background refreshes
+            pool_maxsize=app.config.get('FORMIO_POOL_MAXSIZE') or
+            app.config.get('FORMS_THREADS', 8) + app.config.get('FORMS_BATCH_CONCURRENCY', 8) + 4,
+            retries=app.config.get('FORMIO_RETRIES', 2),
+            backoff_factor=app.config.get('FORMIO_BACKOFF_FACTOR', 0.3),
+            breaker_threshold=app.config.get('FORMIO_BREAKER_THRESHOLD', 5),
+            breaker_recovery=app.config.get('FORMIO_BREAKER_RECOVERY', 30),
+            store=self.shared
         )
-        # Initialize Hashids for obfuscating submission IDs
-        self.hashids = Hashids(
-            salt=app.config.get('HASHIDS_SALT', 'default_salt'),
-            min_length=24,
-            alphabet=app.config.get('HASHIDS_ALPHABET', 'abcdefghijklmnopqrstuvwxyz1234567890')
+        # Slim, pre-digested listing of forms backing the index page
+        self.catalog = FormCatalog(
+            self.formio,
+            ttl=app.config.get('FORMS_CATALOG_TTL', 60),
+            runner=self.formio._in_app_context,
+            store=self.shared
+        )
+        # Form definitions slimmed for the renderer, one compile per form version
+        self.compiler = SchemaCompiler(
+            internal_fields=config_list(app.config, 'FORMS_INTERNAL_FIELDS') or DEFAULT_INTERNAL_FIELDS,
+            maxsize=app.config.get('FORMS_SCHEMA_CACHE_SIZE', 128)
+        )
+        # Codec obfuscating submission IDs (Hashids, optionally a keyed permutation)
+        self.ids = build_codec(app.config)
+        # Bounded fan-out of batch items, shared by all requests of the worker
+        self._batch_concurrency = app.config.get('FORMS_BATCH_CONCURRENCY', 8)
+        self._batch_executor = ThreadPoolExecutor(max_workers=self._batch_concurrency, thread_name_prefix='forms-batch')
+        # Replay protection for Idempotency-Key headers on form submissions
+        self.idempotency = IdempotencyCache(app.config.get('FORMS_IDEMPOTENCY_CACHE_SIZE', 1024))
+        # Optional write-behind spool: accept submissions locally, deliver them in the background
+        self.spool = None
+        if app.config.get('FORMS_SUBMIT_MODE', 'sync') == 'spool':
+            self.spool = SubmissionSpool(
+                app.config.get('FORMS_SPOOL_PATH') or os.path.join(data_dir, 'forms-spool.sqlite3'),
+                deliver=self.formio.submit,
+                runner=self.formio._in_app_context,
+                max_attempts=app.config.get('FORMS_SPOOL_MAX_ATTEMPTS', 10),
+                retention=app.config.get('FORMS_SPOOL_RETENTION', 86400),
+                # A preloading master only forks workers; they deliver
+                start=not app.config.get('FORMS_PRELOAD', False)
+            )
+        REGISTRY.add_collector(self._collect_metrics)
+        # Templates resolve static files through the build manifest
+        app.add_template_global(asset_url, 'forms_asset')
+
+        # Workers forked from a preloading master keep the warm state, not its connections and threads
+        os.register_at_fork(after_in_child=self._after_fork)
+        STARTUP.record('init', time.perf_counter() - started)
+        self._start_warm_up(app)
+
+    def _start_warm_up(self, app):
+        """
+        Prime the token, catalog and most used schemas as configured by FORMS_WARMUP.
+
+        'sync' (the default) warms up before the worker accepts requests,
+        'background' serves at once while /ready answers 503 until warm, and
+        'off' leaves every cache to the first requests. A preloading master
+        always warms up synchronously, before it forks.
+        """
+        mode = app.config.get('FORMS_WARMUP', 'sync')
+        if mode == 'off':
+            STARTUP.mark_ready()
+            return
+        kwargs = dict(
+            forms=config_list(app.config, 'FORMS_WARMUP_FORMS'),
+            max_schemas=app.config.get('FORMS_WARMUP_SCHEMAS', 20),
+            timeout=app.config.get('FORMS_WARMUP_TIMEOUT', 10)
         )
+        if mode == 'background' and not app.config.get('FORMS_PRELOAD', False):
+            Thread(target=warm_up, args=(self,), kwargs=kwargs, name='forms-warmup', daemon=True).start()
+        else:
+            warm_up(self, **kwargs)
+
+    def _after_fork(self):
+        """
+        Give a forked worker its own connections, locks and background threads.
+
+        Threads of the parent (token refresh, warm-up stragglers) may hold any
+        lock at fork time, so every lock the module owns is replaced.
+        """
+        REGISTRY.after_fork()
+        STARTUP.after_fork()
+        self.formio.after_fork()
+        self.catalog.after_fork()
+        self.compiler.after_fork()
+        self.ids.after_fork()
+        self.idempotency.after_fork()
+        self._batch_executor = ThreadPoolExecutor(max_workers=self._batch_concurrency, thread_name_prefix='forms-batch')
+        if self.spool is not None:
+            self.spool.after_fork()
+
+    def render_template(self, template, **kwargs):
+        """Render a template, timed as the 'render' phase."""
+        with phase('render'):
+            return super().render_template(template, **kwargs)
+
+    def _collect_metrics(self):
+        """Publish cache, catalog, permission, token and breaker snapshots as gauges."""
+        sources = {
+            'schema_cache': self.formio.schemas.stats(),
+            'catalog': self.catalog.stats(),
+            'permissions': self.formio.permissions.stats(),
+            'token': self.formio.tokens.stats(),
+            'schema_compiler': self.compiler.stats(),
+            'upstream': self.formio.stats(),
+        }
+        if self.spool is not None:
+            sources['spool'] = self.spool.stats()
+        if self.shared is not None:
+            sources['shared_state'] = self.shared.stats()
+        for source, stats in sources.items():
+            for key, value in stats.items():
+                yield f"forms_{source}_{key}", f"Forms {source.replace('_', ' ')} {key.replace('_', ' ')}.", 'gauge', \
+                    [({}, value)]
+        breaker = self.formio.breaker.stats()
+        yield 'forms_upstream_circuit_open', 'Whether the Form.io circuit breaker is open (1) or not (0).', 'gauge', \
+            [({}, int(breaker['state'] != 'closed'))]
+        yield 'forms_upstream_circuit_rejected', 'Calls refused by the open circuit breaker.', 'gauge', \
+            [({}, breaker['rejected'])]
+        yield 'forms_startup_phase_seconds', 'Duration of each startup phase of this process.', 'gauge', \
+            [({'phase': name}, seconds) for name, seconds in STARTUP.snapshot()['phases'].items()]
+        yield 'forms_ready', 'Whether the startup warm-up has finished (1) or not (0).', 'gauge', \
+            [({}, int(STARTUP.ready))]
 
     def encode_submission_id(self, object_id: str) -> str:
         """
-        Obfuscate a MongoDB ObjectId string using Hashids.
+        Obfuscate a MongoDB ObjectId string using the configured codec.
 
         :param object_id: 24-character hex string of the ObjectId
         :return: Obfuscated hashid string
@@ -293,18 +748,20 @@ class FormsView(BaseView):
         """
         if not isinstance(object_id, str) or len(object_id) != 24:
             raise ValueError("Invalid ObjectId format")
-        return self.hashids.encode_hex(object_id)
+        with phase('hashids'):
+            return self.ids.encode(object_id)
 
     def decode_submission_id(self, obfuscated_id: str) -> str:
         """
         Decode an obfuscated submission ID back to the original ObjectId.
 
-        :param obfuscated_id: Hashids-generated string
+        :param obfuscated_id: Obfuscated id (Hashids or keyed format)
         :return: Original 24-character ObjectId string
         :raises ValueError: If decoding fails or result is invalid
         """
         try:
-            object_id = self.hashids.decode_hex(obfuscated_id)
+            with phase('hashids'):
+                object_id = self.ids.decode(obfuscated_id)
             if not object_id or len(object_id) != 24:
                 raise ValueError()
             return object_id
@@ -312,6 +769,7 @@ class FormsView(BaseView):
             raise ValueError(f"Invalid or corrupt submission ID: {obfuscated_id}") from e
 
     @add_to_menu(location='sidebar', group='Forms', parent='Forms:fa-solid fa-file-lines', label='Formulare', icon='fa-solid fa-file')  # noqa: E501
+    @instrumented('index')
     @has_permissions(['forms.can_read', 'forms.can_read_all'])
     @expose('/', methods=['GET'])
     def index(self):
@@ -324,35 +782,38 @@ class FormsView(BaseView):
 
         :return: JSON or rendered template with form list
         """
-        response = self.formio.get("form?type=form&select=title,name,path,tags,components")
+        requested_category = request.args.get('category', '').lower()
+        suffixes = self.formio.permissions.compile_user(current_user.permissions)
+        view_root = self.app.config.get('APPLICATION_ROOT') + 'view/'
+        records = self.catalog.forms(requested_category or None)
+
+        etag = None
+        if request.args.get('form') == 'json':
+            # The listing only changes with the catalog or the user's permission set
+            etag = make_etag('index', self.catalog.version, requested_category, view_root, *sorted(suffixes))
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
 
         forms = []
-        requested_category = request.args.get('category', '').lower()
-        for form in response.json():
-            tags = form.get("tags", [])
-            if not tags:
+        for record in records:
+            if not record['tagged']:
                 continue  # Skip forms without tags
-
-            # Extract category tags prefixed with 'cat:'
-            categories = [tag.split("cat:")[1] for tag in tags if tag.startswith("cat:")]
-            if requested_category and requested_category not in [c.lower() for c in categories]:
+            if not self.formio.permissions.allows(suffixes, record['required']):
                 continue
-
-            # Use first component's 'content' as description
-            description = form.get('components', [{}])[0].get('content', '')
-            form.update({
-                "category": categories,
-                "description": description,
-                "path": self.app.config.get('APPLICATION_ROOT') + 'view/' + form.get('path')
+            forms.append({
+                "_id": record['_id'],
+                "title": record['title'],
+                "name": record['name'],
+                "category": record['category'],
+                "description": record['description'],
+                "path": view_root + record['path']
             })
-            form.pop("tags", None)
-            form.pop("components", None)
-            forms.append(form)
-            print(self.app.config.get('APPLICATION_ROOT'))
         if request.args.get('form') == 'json':
-            return jsonify(forms)
+            return json_response(forms, etag=etag)
         return self.render_template('forms.jinja2', title='Forms', forms=forms)
 
+    @instrumented('form_view')
     @has_permissions(['forms.can_read', 'forms.can_read_all'])
     @expose('/view/<form_path>', methods=['GET'])
     def form_view(self, form_path):
@@ -365,61 +826,319 @@ class FormsView(BaseView):
         if form_path == 'favicon.ico':
             return '', 204  # Ignore favicon requests
 
-        response = self.formio.get(f"{form_path}?select=title,tags,name,components", form_id=form_path)
-        form_data = response.json()
-        # Remove internal auth_user_email field from form components
-        form_json = {
-            'components': [c for c in form_data.get('components', []) if c.get('key') != 'auth_user_email']
-        }
+        form = self.formio.get_form(form_path)
+        if not self.formio.permissions.check(current_user.permissions, form.data):
+            return jsonify({'message': 'You do not have permission to do that!'}), 403
 
+        # Slimmed, pre-serialized schema, compiled once per form version
+        compiled = self.compiler.compile(form)
         if request.args.get('form') == 'json':
-            form_data['path'] = request.path
-            return jsonify(form_data)
-        return self.render_template('forms-form.jinja2', title=form_data.get('title'), form_json=form_json)
+            # A revalidation costs neither an upstream call nor serialization
+            body, etag, variants = compiled.json(request.path)
+            return bytes_response(body, etag, variants=variants)
+        return self.render_template('forms-form.jinja2', title=compiled.title, form_schema=compiled.script)
 
+    @instrumented('form_post')
     @has_permissions(['forms.can_create'])
     @expose('/view/<form_path>', methods=['POST'])
     def form_post(self, form_path):
         """
         @todo: Probably a good idea to encode all _ids
-        Handle submission of a form by POSTing data to Form.io.
+        Handle submission of a form by POSTing data to Form.io, or by spooling it
+        for background delivery when FORMS_SUBMIT_MODE is 'spool'.
+
+        Retries carrying the same ``Idempotency-Key`` header are answered
+        without submitting twice.
 
         :param form_path: Path identifier for the form
-        :return: JSON payload of created submission data
+        :return: JSON payload of created (or accepted) submission data
         """
         payload = request.get_json()
-        response = self.formio.post(f"{form_path}/submission", form_id=form_path, json_payload=payload)
-        if response.status_code in [200, 201]:
-            # Return only the 'data' section of the response
-            return jsonify(response.json().get('data'))
+        key = idempotency_scope(current_user.email, form_path, request.headers.get('Idempotency-Key'))
+        if self.spool is not None:
+            return self._spool_submission(form_path, payload, key)
+
+        if key:
+            proceed, replay = self.idempotency.begin(key)
+            if not proceed:
+                if replay is None:
+                    return jsonify({'message': 'This submission is already being processed.', 'class': 'is-warning'}), 409
+                response = jsonify(replay)
+                response.headers['Idempotent-Replayed'] = 'true'
+                return response
+
+        result = None
+        try:
+            response = self.formio.post(f"{form_path}/submission", form_id=form_path, json_payload=payload)
+            if response.status_code in [200, 201]:
+                # Return only the 'data' section of the response
+                result = response.json().get('data')
+                return jsonify(result)
+
+            return response
+        finally:
+            if key:
+                self.idempotency.finish(key, result)
+
+    def _spool_submission(self, form_path, payload, key):
+        """
+        Authorize a submission and commit it to the spool; Form.io receives it from the delivery thread.
 
+        :param form_path: Path identifier for the form
+        :param payload: Submission body sent by the browser
+        :param key: Scoped idempotency key, or None
+        :return: 202 response with the accepted submission data
+        """
+        form = self.formio.get_form(form_path)
+        if not self.formio.permissions.check(current_user.permissions, form.data):
+            return jsonify({'message': 'You do not have permission to do that!'}), 403
+        if not isinstance(payload, dict):
+            abort(400, description="Expected a JSON submission")
+
+        payload.setdefault('data', {})['auth_user_email'] = current_user.email
+        spool_id, created = self.spool.enqueue(form_path, payload, key)
+
+        data = dict(payload['data'])
+        data.pop('auth_user_email', None)
+        response = make_response(jsonify(data), 202)
+        response.headers['X-Forms-Spool-Id'] = str(spool_id)
+        if not created:
+            response.headers['Idempotent-Replayed'] = 'true'
         return response
 
+    @instrumented('form_submissions')
     @has_permissions(['forms.can_read', 'form.can_read_all'])
     @expose('/view/<form_path>/submission', methods=['GET'])
     def form_submissions(self, form_path):
         """
-        List submissions for the current user on a form.
+        List submissions for the current user on a form, one page at a time.
+
+        Search, filters and the date range are passed to Form.io as query
+        operators, so only matching rows leave Form.io.
+
+        Query Parameters:
+          - page, per_page: Page number (1-based) and size, passed to Form.io as skip/limit
+          - sort: Form.io sort expression (default '-created')
+          - q, field, f.<field>[__<op>], from, to: Search and filters (see filters.submission_query)
+          - form=json: Return JSON response instead of HTML
+          - form=columns: Return JSON as a column list plus row arrays
+          - form=rows: Return only the table rows, as an HTML fragment
+          - stream=1: With form=json, stream rows (all pages unless 'page' is given)
+          - view=table|virtual: HTML rendering (default FORMS_SUBMISSIONS_VIEW); 'virtual' sends
+            an empty page that loads form=columns pages and only builds the visible rows
 
         :param form_path: Path identifier for the form
-        :return: JSON or rendered template with submissions list
+        :return: JSON, HTML fragment or rendered template with submissions list
         """
-        # Filter to only submissions by this user
-        submission_resp = self.formio.get(
-            f"{form_path}/submission?data.auth_user_email={current_user.email}",
-            form_id=form_path
-        )
-        submissions = submission_resp.json()
-        for sub in submissions:
-            # Obfuscate the internal MongoDB _id
-            sub['obfuscated_id'] = self.encode_submission_id(sub.pop('_id'))
+        page = self._page_args()
+        form = self.formio.get_form(form_path)
+        # Every output mode lists the same rows, so they share the form-level check
+        if not self.formio.permissions.check(current_user.permissions, form.data):
+            return jsonify({'message': 'You do not have permission to do that!'}), 403
+        fields = schema_columns(form.data.get('components'))
+        query = self._filter_args(fields)
+        # Filter to only submissions by this user (after the user's filters, so it can't be overridden)
+        query.update({'data.auth_user_email': current_user.email, 'sort': self._sort_arg()})
+
+        output = request.args.get('form')
+        view = request.args.get('view') or self.app.config.get('FORMS_SUBMISSIONS_VIEW', 'table')
+        if output is None and view == 'virtual':
+            # No upstream call: the page fetches its rows as columnar JSON
+            return self.render_template('forms-submissions-virtual.jinja2', title=form_path, fields=fields,
+                                        args=request.args.to_dict(),
+                                        page_size=self.app.config.get('FORMS_MAX_PAGE_SIZE', 500))
+
+        submissions = self.formio.get_page(f"{form_path}/submission", page, form_id=form_path, params=query)
+        if not isinstance(submissions, list):
+            return submissions
+
+        if output == 'json':
+            if request.args.get('stream'):
+                return self._stream_submissions(form_path, page, submissions, query)
+            # ETag is a hash of the filtered, converted payload
+            response = json_response(self._submission_rows(submissions))
+            if response.status_code == 200:
+                self._set_range_headers(response, page, len(submissions))
+            return response
+
+        submissions = self._submission_rows(submissions)
+        if output == 'columns':
+            payload = dict(columnar(submissions, fields), total=page.total, page=page.number, per_page=page.size)
+            response = json_response(payload)
+            if response.status_code == 200:
+                self._set_range_headers(response, page, len(submissions))
+            return response
+        # The page header and the rows a live search swaps in share one column list
+        columns = table_columns(submissions, fields)
+        if output == 'rows':
+            response = make_response(self.render_template('forms-submission-rows.jinja2', submissions=submissions,
+                                                          columns=columns))
+            return self._set_range_headers(response, page, len(submissions))
+        return self.render_template('forms-submissions.jinja2', title=form_path, submissions=submissions, page=page,
+                                    fields=fields, columns=columns, args=request.args.to_dict())
+
+    def _page_args(self):
+        """
+        Read 'page' and 'per_page' from the query string.
+
+        :return: Page clamped to FORMS_MAX_PAGE_SIZE
+        """
+        number = max(request.args.get('page', 1, type=int), 1)
+        size = request.args.get('per_page', self.app.config.get('FORMS_PAGE_SIZE', 50), type=int)
+        size = min(max(size, 1), self.app.config.get('FORMS_MAX_PAGE_SIZE', 500))
+        return Page(number, size)
+
+    @staticmethod
+    def _sort_arg(default='-created'):
+        """
+        Read and validate the 'sort' query parameter.
+
+        :raises: aborts with 400 on an invalid field name
+        :return: Form.io sort expression
+        """
+        sort = request.args.get('sort', default)
+        if not SORT_PATTERN.fullmatch(sort):
+            abort(400, description="Invalid sort parameter")
+        return sort
+
+    @staticmethod
+    def _filter_args(fields):
+        """
+        Read the search, filter and date range parameters.
+
+        :param fields: Data keys of the form that may be searched and filtered
+        :raises: aborts with 400 on an unknown field/operator or an invalid date
+        :return: dict of Form.io query parameters
+        """
+        try:
+            return submission_query(request.args, fields)
+        except ValueError as e:
+            abort(400, description=str(e))
+
+    @staticmethod
+    def _set_range_headers(response, page, count):
+        """Expose upstream pagination totals on a listing response."""
+        response.headers['Content-Range'] = page.content_range(count)
+        if page.total is not None:
+            response.headers['X-Total-Count'] = str(page.total)
+        return response
+
+    def _submission_rows(self, subs):
+        """
+        Prepare a page of submissions for output: obfuscate ids in one batch and parse creation dates.
+
+        :param subs: List of submission dicts from Form.io (modified in place)
+        :raises ValueError: If a submission id is not a valid ObjectId
+        :return: the same list
+        """
+        object_ids = [sub.pop('_id') for sub in subs]
+        if not all(isinstance(object_id, str) and len(object_id) == 24 for object_id in object_ids):
+            raise ValueError("Invalid ObjectId format")
+        with phase('hashids'):
+            # Obfuscate the internal MongoDB _ids
+            tokens = self.ids.encode_many(object_ids)
+        for sub, token in zip(subs, tokens):
+            sub['obfuscated_id'] = token
             # Convert ISO timestamp to datetime object
             sub['created'] = datetime.fromisoformat(sub['created'].replace('Z', '+00:00'))
+        return subs
 
-        if request.args.get('form') == 'json':
-            return jsonify(submissions)
-        return self.render_template('forms-submissions.jinja2', title=form_path, submissions=submissions)
+    def _stream_submissions(self, form_path, page, first_items, query):
+        """
+        Stream submissions as a JSON array, converting rows as they are written.
+
+        Without an explicit 'page' parameter every remaining page is streamed,
+        so memory stays bounded by one upstream page.
+
+        :return: streaming Flask response
+        """
+        if 'page' in request.args:
+            pages = iter([first_items])
+        else:
+            pages = self.formio.iter_pages(
+                f"{form_path}/submission", page_size=page.size, form_id=form_path,
+                params=query, first=(page, first_items)
+            )
+        dumps = self.app.json.dumps
+
+        def generate():
+            yield '['
+            separator = ''
+            for items in pages:
+                for sub in self._submission_rows(items):
+                    yield separator + dumps(sub)
+                    separator = ','
+            yield ']'
+
+        response = Response(stream_with_context(generate()), mimetype='application/json')
+        if page.total is not None:
+            response.headers['X-Total-Count'] = str(page.total)
+        return response
+
+    @instrumented('form_export')
+    @has_permissions(['forms.can_read', 'form.can_read_all'])
+    @expose('/view/<form_path>/export', methods=['GET'])
+    def form_export(self, form_path):
+        """
+        Stream submissions of a form as NDJSON or CSV.
+
+        Form.io is walked page by page through FormioAPI, with the next page
+        prefetched while the current one is written, so memory stays constant
+        regardless of row count. Like the submissions listing, only the
+        current user's own submissions are exported.
+
+        Query Parameters:
+          - format: 'ndjson' (default) or 'csv'
+          - q, field, f.<field>[__<op>], from, to: Same filters as the submissions listing
+
+        :param form_path: Path identifier for the form
+        :return: streaming response
+        """
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            abort(400, description="Unsupported export format")
+
+        form = self.formio.get_form(form_path)
+        user_permissions = current_user.permissions
+        if not self.formio.permissions.check(user_permissions, form.data):
+            return jsonify({'message': 'You do not have permission to do that!'}), 403
+
+        columns = schema_columns(form.data.get('components'))
+        query = self._filter_args(columns)
+        # Filter to only submissions by this user (after the user's filters, so it can't be overridden)
+        query.update({'data.auth_user_email': current_user.email, 'sort': 'created'})
+
+        pages = map(self._submission_rows, prefetched(
+            self.formio.iter_pages(
+                f"{form_path}/submission",
+                page_size=self.app.config.get('FORMS_EXPORT_PAGE_SIZE', 500),
+                params=query,
+                raw=True
+            ),
+            runner=self.formio._in_app_context
+        ))
+
+        if export_format == 'csv':
+            body = csv_lines(pages, self._export_row, columns)
+            mimetype = 'text/csv'
+        else:
+            body = ndjson_lines(pages, self._export_row)
+            mimetype = 'application/x-ndjson'
+
+        response = Response(stream_with_context(body), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="{form_path}-submissions.{export_format}"'
+        response.headers['X-Accel-Buffering'] = 'no'  # Don't let a reverse proxy buffer the stream
+        return response
+
+    def _export_row(self, sub):
+        """Shape a prepared submission for export: obfuscated id, ISO-8601 'created', data only."""
+        return {
+            'obfuscated_id': sub['obfuscated_id'],
+            'created': sub['created'].isoformat(),
+            'data': sub.get('data') or {}
+        }
 
+    @instrumented('form_single_submission')
     @has_permissions(['forms.can_read', 'form.can_read_all'])
     @expose('/view/<form_path>/submission/<submission_id>', methods=['GET'])
     def form_single_submission(self, form_path, submission_id):
@@ -438,6 +1157,7 @@ class FormsView(BaseView):
             return jsonify(response.json())
         return self.render_template('forms-submission-view.jinja2', title=form_path)
 
+    @instrumented('form_put')
     @has_permissions(['forms.can_update', 'form.can_update_all'])
     @expose('/view/<form_path>/submission/<submission_id>', methods=['PUT'])
     def form_put(self, form_path, submission_id):
@@ -455,5 +1175,122 @@ class FormsView(BaseView):
             form_id=form_path,
             json_payload=payload
         )
+        if not isinstance(response, requests.Response):
+            # Rejected upstream or denied: already a sanitized error response
+            return response
 
         return jsonify(response.json())
+
+    @instrumented('batch')
+    @has_permissions(['forms.can_read', 'forms.can_read_all'])
+    @expose('/batch', methods=['POST'])
+    def batch(self):
+        """
+        Fetch several form schemas and submissions in one round trip.
+
+        Request body::
+
+            {"forms": ["<form path>", ...],
+             "submissions": [{"form": "<form path>", "id": "<obfuscated id>"}, ...]}
+
+        Items are fetched concurrently through a bounded pool
+        (FORMS_BATCH_CONCURRENCY) and authorized one by one, like the single
+        form and submission views: a denied, missing or failed item gets its own
+        status and does not fail the batch.
+
+        :return: JSON {"forms": [...], "submissions": [...]}, results in request order,
+                 each with 'status' and either 'data' or 'message'
+        """
+        body = request.get_json(silent=True)
+        forms = (body.get('forms') or []) if isinstance(body, dict) else None
+        submissions = (body.get('submissions') or []) if isinstance(body, dict) else None
+        if not isinstance(forms, list) or not all(isinstance(path, str) for path in forms) \
+                or not isinstance(submissions, list) \
+                or not all(isinstance(item, dict) and isinstance(item.get('form'), str)
+                           and isinstance(item.get('id'), str) for item in submissions):
+            abort(400, description="Expected {'forms': [path, ...], 'submissions': [{'form': path, 'id': id}, ...]}")
+        limit = self.app.config.get('FORMS_BATCH_MAX_ITEMS', 50)
+        if len(forms) + len(submissions) > limit:
+            abort(400, description=f"At most {limit} items per batch")
+
+        # Pool threads have no request context: read the user's permissions here
+        permissions = current_user.permissions
+        view_root = self.app.config.get('APPLICATION_ROOT') + 'view/'
+        # Duplicates share one upstream call (schema cache single-flight, coalesced GETs)
+        form_jobs = [self._batch_executor.submit(self._batch_item, self._batch_form, path, permissions, view_root)
+                     for path in forms]
+        submission_jobs = [self._batch_executor.submit(self._batch_item, self._batch_submission, item['form'],
+                                                       item['id'], permissions)
+                           for item in submissions]
+        return json_response({
+            'forms': [dict(job.result(), path=path) for path, job in zip(forms, form_jobs)],
+            'submissions': [dict(job.result(), form=item['form'], id=item['id'])
+                            for item, job in zip(submissions, submission_jobs)],
+        })
+
+    def _batch_item(self, fn, *args):
+        """
+        Run one batch item in an app context, turning its failure into a status.
+
+        :return: dict with 'status' and 'data' or 'message'
+        """
+        try:
+            return {'status': 200, 'data': self.formio._in_app_context(fn, *args)}
+        except HTTPException as e:
+            return {'status': e.code, 'message': e.description}
+        except ValueError as e:
+            return {'status': 400, 'message': str(e)}
+        except Exception:
+            self.app.logger.exception(f"Batch item {fn.__name__}{args[:2]} failed")
+            return {'status': 500, 'message': 'Internal error'}
+
+    def _batch_form(self, form_path, permissions, view_root):
+        """A form's slimmed schema, as served by form_view with form=json."""
+        form = self.formio.get_form(form_path)
+        if not self.formio.permissions.check(permissions, form.data):
+            abort(403, description='You do not have permission to do that!')
+        return self.compiler.compile(form).data(view_root + form_path)
+
+    def _batch_submission(self, form_path, submission_id, permissions):
+        """A submission, as served by form_single_submission, with its id obfuscated."""
+        form = self.formio.get_form(form_path)
+        if not self.formio.permissions.check(permissions, form.data):
+            abort(403, description='You do not have permission to do that!')
+        submission = self.formio.fetch_submission(form_path, self.decode_submission_id(submission_id))
+        submission.pop('_id', None)
+        submission['obfuscated_id'] = submission_id
+        return submission
+
+
+class MetricsView(BaseView):
+    """
+    Prometheus and readiness endpoints for the Forms module.
+
+    Scrapers must send FORMS_METRICS_TOKEN as a bearer token; without a
+    token configured, /metrics is disabled.
+    """
+    default_view = 'metrics'
+
+    @expose('/metrics', methods=['GET'])
+    def metrics(self):
+        """
+        Render every Forms metric in the Prometheus text format.
+
+        :return: text/plain metrics body
+        """
+        token = self.app.config.get('FORMS_METRICS_TOKEN')
+        if not token:
+            abort(404, description="Metrics are disabled: FORMS_METRICS_TOKEN is not set")
+        if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f"Bearer {token}".encode()):
+            abort(401, description="Invalid metrics token")
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+    @expose('/ready', methods=['GET'])
+    def ready(self):
+        """
+        Readiness probe: 200 once the startup warm-up has finished, 503 until then.
+
+        :return: JSON startup report (phase timings in seconds, errors, primed schemas)
+        """
+        report = STARTUP.snapshot()
+        return jsonify(report), 200 if report['ready'] else 503
@@ -0,0 +1,180 @@
+"""
+Startup warm-up for the Forms module.
+
+A fresh worker has no machine token, no catalog and no cached schemas, so its
+first requests would each wait on Form.io. ``warm_up`` primes them in
+parallel, within a deadline, before the worker serves traffic, and records
+how long each startup phase took. Under gunicorn's ``--preload``
+(FORMS_PRELOAD) it runs once in the master: the warmed, read-mostly state is
+inherited copy-on-write by every forked worker, which then only replaces its
+connections, locks and background threads (see FormsView._after_fork).
+"""
+# Standard library imports
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from threading import Lock
+
+# Upstream calls in flight during the warm-up
+WARMUP_CONCURRENCY = 8
+
+
+class StartupReport:
+    """Startup phase timings and readiness of this process."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.ready_at = None
+        self.phases = {}  # phase name -> seconds
+        self.errors = {}  # phase name -> error message
+        self.primed = 0   # form schemas loaded by the warm-up
+        self._lock = Lock()
+
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a startup phase, recording its error (re-raised) if it fails."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.fail(name, str(e) or e.__class__.__name__)
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.phases[name] = seconds
+
+    def fail(self, name, message):
+        with self._lock:
+            self.errors[name] = message
+
+    def after_fork(self):
+        self._lock = Lock()
+
+    def mark_ready(self):
+        self.ready_at = time.time()
+
+    def snapshot(self):
+        """
+        Snapshot of the startup report, as served by the readiness endpoint.
+
+        :return: dict with readiness, phase timings in seconds, errors and primed schemas
+        """
+        with self._lock:
+            return {
+                'ready': self.ready,
+                'startup_seconds': self.ready_at - self.started_at if self.ready else None,
+                'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+                'errors': dict(self.errors),
+                'primed_schemas': self.primed,
+            }
+
+
+# Report of this process; forked workers inherit the master's
+STARTUP = StartupReport()
+
+
+def pick_forms(records, forms=(), limit=20):
+    """
+    Choose the form schemas to prime.
+
+    Form.io keeps no usage counts, so configured forms come first and the
+    most recently modified catalog forms, the ones most likely in active
+    use, fill up the list.
+
+    :param records: Catalog records
+    :param forms: Form paths always primed (FORMS_WARMUP_FORMS)
+    :param limit: Maximum number of paths
+    :return: list of form paths
+    """
+    paths = list(dict.fromkeys(forms))
+    recent = sorted((r for r in records if r.get('path')), key=lambda r: r.get('modified') or '', reverse=True)
+    for record in recent:
+        if len(paths) >= limit:
+            break
+        if record['path'] not in paths:
+            paths.append(record['path'])
+    return paths[:limit]
+
+
+def warm_up(view, forms=(), max_schemas=20, timeout=10, report=STARTUP):
+    """
+    Prime the machine token, the form catalog and the most used form schemas.
+
+    Returns once everything is primed or the deadline passed; a worker doing
+    this at load time only accepts requests once it is warm. Failures are
+    logged and reported, never raised: a worker still starts while Form.io
+    is down.
+
+    :param view: FormsView
+    :param forms: Form paths always primed (FORMS_WARMUP_FORMS)
+    :param max_schemas: Form schemas primed at most
+    :param timeout: Overall deadline in seconds; keep it below the gunicorn worker timeout
+    :param report: StartupReport to record timings in
+    :return: report
+    """
+    logger = view.app.logger
+    run = view.formio._in_app_context
+    deadline = time.monotonic() + timeout
+
+    def timed(name, fn, *args):
+        with report.phase(name):
+            return run(fn, *args)
+
+    def token():
+        # Every other call needs the token: they queue behind this single login
+        if view.formio.tokens.get() is None:
+            raise RuntimeError("Form.io machine login failed")
+
+    finished = []
+
+    def schema(path):
+        # Fetch and compile, so the first render of the form does neither
+        try:
+            view.compiler.compile(view.formio.schemas.get(path))
+        finally:
+            finished.append(time.perf_counter())
+
+    def remaining():
+        return max(deadline - time.monotonic(), 0)
+
+    executor = ThreadPoolExecutor(max_workers=WARMUP_CONCURRENCY, thread_name_prefix='forms-warmup')
+    started = time.perf_counter()
+    try:
+        # The catalog and the configured forms load in parallel, behind the token
+        pending = [executor.submit(timed, 'token', token), executor.submit(timed, 'catalog', view.catalog.sync)]
+        catalog = pending[1]
+        schemas = {path: executor.submit(run, schema, path) for path in list(dict.fromkeys(forms))[:max_schemas]}
+
+        wait([catalog], timeout=remaining())
+        if catalog.done() and catalog.exception() is None:
+            for path in pick_forms(view.catalog.forms(), forms, max_schemas):
+                if path not in schemas:
+                    schemas[path] = executor.submit(run, schema, path)
+
+        done, not_done = wait(pending + list(schemas.values()), timeout=remaining())
+        if finished:
+            report.record('schemas', max(finished) - started)
+        report.primed = sum(1 for future in schemas.values() if future in done and future.exception() is None)
+        failed = [path for path, future in schemas.items() if future in done and future.exception() is not None]
+        if failed:
+            report.fail('schemas', f"{len(failed)} failed, e.g. {failed[0]}: {schemas[failed[0]].exception()}")
+        if not_done:
+            report.fail('deadline', f"{len(not_done)} calls unfinished after {timeout}s")
+    finally:
+        # Stragglers finish in the background; nothing waits for them
+        executor.shutdown(wait=False, cancel_futures=True)
+        report.record('warmup', time.perf_counter() - started)
+        report.mark_ready()
+
+    timings = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in report.phases.items())
+    logger.info(f"Forms warm-up: {timings}; {report.primed} schemas primed")
+    for name, error in report.errors.items():
+        logger.warning(f"Forms warm-up {name}: {error}")
+    return report
@@ -0,0 +1,276 @@
+"""
+Local Form.io stand-in for benchmarks.
+
+Emulates the parts of the Form.io API used by the Forms module:
+machine/login, form listings, single forms and submissions (list, get,
+create, update), including limit/skip/sort/select and Content-Range.
+Latency, payload size and row counts are configurable.
+
+Run standalone with ``python -m bench.fake_formio --port 3001``.
+"""
+# Standard library imports
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SECRET = b'bench-secret'
+
+
+def make_jwt(ttl):
+    """Build an HS256 JWT carrying only an 'exp' claim."""
+    def b64(data):
+        return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+    header = b64(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())
+    payload = b64(json.dumps({'exp': int(time.time() + ttl), 'user': {'_id': 'bench'}}).encode())
+    signature = b64(hmac.new(SECRET, header + b'.' + payload, hashlib.sha256).digest())
+    return (header + b'.' + payload + b'.' + signature).decode()
+
+
+def object_id(n):
+    """Deterministic 24-hex-character ObjectId."""
+    return f"{n:024x}"
+
+
+class FakeFormio:
+    """In-memory data set and behaviour knobs shared by all handler threads."""
+
+    def __init__(self, forms=20, components=40, rows=1000, fields=12, field_size=32,
+                 latency=0.02, jitter=0.01, token_ttl=3600):
+        """
+        :param forms: Number of forms
+        :param components: Top-level components per form (each nests a panel every 10th)
+        :param rows: Submissions per form
+        :param fields: Data fields per submission
+        :param field_size: Characters per field value
+        :param latency: Base latency added to every response, in seconds
+        :param jitter: Random extra latency, in seconds
+        :param token_ttl: Lifetime of issued machine tokens, in seconds
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.token_ttl = token_ttl
+        self.rows = rows
+        self.fields = fields
+        self.field_size = field_size
+        self.lock = threading.Lock()
+        self.calls = {}
+
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.forms = {}
+        for i in range(forms):
+            path = f"form{i}"
+            self.forms[path] = {
+                '_id': object_id(i + 1),
+                'title': f"Form {i}",
+                'name': path,
+                'path': path,
+                'type': 'form',
+                'tags': [f"cat:category{i % 4}", 'perm:can_read'],
+                'modified': (base + timedelta(days=i)).isoformat().replace('+00:00', '.000Z'),
+                'components': self._components(components, fields),
+            }
+        self.submissions = {path: {} for path in self.forms}
+        self.created = base
+
+    def _components(self, count, fields):
+        components = [{'type': 'content', 'key': 'form_description', 'input': False,
+                       'content': '<p>Benchmark form</p>'}]
+        for i in range(count):
+            field = {'type': 'textfield', 'key': f"field{i % fields}", 'label': f"Field {i}", 'input': True,
+                     'tableView': True, 'placeholder': '', 'validate': {'required': False, 'custom': ''},
+                     'conditional': {'show': None, 'when': None, 'eq': ''}}
+            if i % 10 == 9:
+                field = {'type': 'panel', 'key': f"panel{i}", 'input': False, 'components': [field]}
+            components.append(field)
+        components.append({'type': 'textfield', 'key': 'auth_user_email', 'input': True, 'hidden': True})
+        components.append({'type': 'button', 'key': 'submit', 'input': True, 'label': 'Submit'})
+        return components
+
+    def submission(self, path, n):
+        """Return submission ``n`` of a form, generating it on first access."""
+        store = self.submissions[path]
+        sub = store.get(n)
+        if sub is None:
+            data = {f"field{f}": ('x' * self.field_size) for f in range(self.fields)}
+            data.update({'auth_user_email': 'bench@example.org', 'submit': True})
+            sub = {
+                '_id': object_id(0x100000 + n),
+                'form': self.forms[path]['_id'],
+                'created': (self.created + timedelta(minutes=n)).isoformat().replace('+00:00', '.000Z'),
+                'modified': (self.created + timedelta(minutes=n)).isoformat().replace('+00:00', '.000Z'),
+                'data': data,
+            }
+            store[n] = sub
+        return sub
+
+    def count(self, route):
+        with self.lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+
+    def sleep(self):
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+
+
+def _select(doc, select):
+    if not select:
+        return doc
+    fields = set(select.split(',')) | {'_id'}
+    return {k: v for k, v in doc.items() if k in fields}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    formio = None  # Set by serve()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_body(self):
+        # Every request's body is drained: on a keep-alive connection unread bytes would prefix the next request
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'{}')
+        except ValueError:
+            return {}
+
+    def _authorized(self):
+        if not self.headers.get('X-Jwt-Token'):
+            self._send(401, {'message': 'Unauthorized'})
+            return False
+        return True
+
+    def _list(self, items, query, select=None):
+        limit = int(query.get('limit', ['10'])[0])
+        skip = int(query.get('skip', ['0'])[0])
+        page = [_select(item, select) for item in items[skip:skip + limit]]
+        total = len(items)
+        content_range = f"{skip}-{skip + len(page) - 1}/{total}" if page else f"*/{total}"
+        self._send(200 if len(page) == total else 206, page, {'Content-Range': content_range})
+
+    def _route(self, method):
+        formio = self.formio
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+        select = query.get('select', [None])[0]
+        body = self._read_body()
+        formio.sleep()
+
+        if method == 'POST' and parts == ['machine', 'login']:
+            formio.count('machine/login')
+            self._send(200, {'_id': 'bench'}, {'X-Jwt-Token': make_jwt(formio.token_ttl)})
+            return
+        if not self._authorized():
+            return
+
+        if parts == ['form'] and method == 'GET':
+            formio.count('form')
+            forms = sorted(formio.forms.values(), key=lambda f: f['title'])
+            since = query.get('modified__gt', [None])[0]
+            if since:
+                forms = [f for f in forms if f['modified'] > since]
+            self._list(forms, query, select)
+            return
+
+        if not parts or parts[0] not in formio.forms:
+            self._send(404, {'message': 'Not found'})
+            return
+        path = parts[0]
+
+        if len(parts) == 1 and method == 'GET':
+            formio.count('<path>')
+            self._send(200, _select(formio.forms[path], select))
+        elif len(parts) == 2 and parts[1] == 'submission' and method == 'GET':
+            formio.count('<path>/submission')
+            rows = [formio.submission(path, n) for n in range(formio.rows)]
+            if query.get('sort', [''])[0].startswith('-'):
+                rows.reverse()
+            self._list(rows, query, select)
+        elif len(parts) == 2 and parts[1] == 'submission' and method == 'POST':
+            formio.count('<path>/submission POST')
+            with formio.lock:
+                n = formio.rows + len(formio.submissions[path])
+            sub = dict(formio.submission(path, n), data=body.get('data', {}))
+            self._send(201, sub)
+        elif len(parts) == 3 and parts[1] == 'submission':
+            n = int(parts[2], 16) - 0x100000
+            if not 0 <= n < formio.rows:
+                self._send(404, {'message': 'Not found'})
+                return
+            formio.count(f"<path>/submission/<id> {method}")
+            sub = formio.submission(path, n)
+            if method == 'PUT':
+                sub = dict(sub, data=body.get('data', sub['data']))
+            self._send(200, sub)
+        else:
+            self._send(405, {'message': 'Method not allowed'})
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_PUT(self):
+        self._route('PUT')
+
+
+def serve(formio, host='127.0.0.1', port=0):
+    """
+    Start the fake Form.io server on a daemon thread.
+
+    :param formio: FakeFormio data set
+    :return: (server, base_url)
+    """
+    handler = type('BoundHandler', (Handler,), {'formio': formio})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-formio', daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group('fake Form.io')
+    group.add_argument('--forms', type=int, default=20, help='number of forms')
+    group.add_argument('--components', type=int, default=40, help='components per form')
+    group.add_argument('--rows', type=int, default=1000, help='submissions per form')
+    group.add_argument('--fields', type=int, default=12, help='data fields per submission')
+    group.add_argument('--field-size', type=int, default=32, help='characters per field value')
+    group.add_argument('--latency', type=float, default=0.02, help='upstream latency in seconds')
+    group.add_argument('--jitter', type=float, default=0.01, help='random extra latency in seconds')
+
+
+def from_arguments(args):
+    return FakeFormio(forms=args.forms, components=args.components, rows=args.rows, fields=args.fields,
+                      field_size=args.field_size, latency=args.latency, jitter=args.jitter)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001)
+    add_arguments(parser)
+    arguments = parser.parse_args()
+    _, base_url = serve(from_arguments(arguments), arguments.host, arguments.port)
+    print(f"Fake Form.io listening on {base_url}")
+    threading.Event().wait()
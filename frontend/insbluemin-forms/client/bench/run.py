@@ -0,0 +1,289 @@
+"""
+Load scenarios for the Forms module.
+
+Starts the fake Form.io server, launches the application under the real
+gunicorn config (gunicorn.conf.py) pointed at it, and drives the index,
+form_view, form_submissions, form_post and form_put endpoints. Reports
+throughput, p50/p95/p99 latency and per-worker memory as a table and,
+optionally, as JSON for CI. With ``--baseline`` the run fails when a
+scenario's p95 or throughput regresses by more than ``--max-regression``.
+
+Usage (from the client directory)::
+
+    python -m bench.run --duration 20 --concurrency 16 --json bench.json
+"""
+# Standard library imports
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from . import fake_formio
+
+CLIENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ('index', 'form_view', 'form_submissions', 'form_post', 'form_put')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    index = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Application did not start listening on port {port}")
+
+
+def worker_pids(master_pid):
+    """Return the PIDs of gunicorn workers (children of the master)."""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == master_pid:
+            pids.append(int(entry))
+    return pids
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux only), or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class Client:
+    """Keep-alive HTTP client, one per load thread."""
+
+    def __init__(self, port, headers):
+        self.port = port
+        self.headers = headers
+        self.conn = None
+
+    def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = dict(self.headers)
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                data = resp.read()
+                return resp.status, data
+            except (http.client.HTTPException, OSError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+
+
+def build_requests(client, form_paths):
+    """
+    Resolve the concrete request for each scenario.
+
+    form_put needs a real obfuscated submission id, taken from a JSON listing.
+    """
+    form = form_paths[0]
+    status, body = client.request('GET', f"/view/{form}/submission?form=json&per_page=1")
+    submission_id = None
+    if status == 200:
+        rows = json.loads(body)
+        submission_id = rows[0]['obfuscated_id'] if rows else None
+    payload = {'data': {'field0': 'bench', 'submit': True}}
+    return {
+        'index': lambda i: ('GET', '/', None),
+        'form_view': lambda i: ('GET', f"/view/{form_paths[i % len(form_paths)]}", None),
+        'form_submissions': lambda i: ('GET', f"/view/{form}/submission", None),
+        'form_post': lambda i: ('POST', f"/view/{form}", payload),
+        'form_put': lambda i: ('PUT', f"/view/{form}/submission/{submission_id}", payload) if submission_id else None,
+    }
+
+
+def run_scenario(name, make_request, port, headers, concurrency, duration):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def worker(offset):
+        client = Client(port, headers)
+        i = offset
+        local, local_errors = [], 0
+        while time.time() < stop_at:
+            request = make_request(i)
+            i += concurrency
+            if request is None:
+                return
+            started = time.perf_counter()
+            try:
+                status, _ = client.request(*request)
+            except (http.client.HTTPException, OSError):
+                status = 0
+            local.append(time.perf_counter() - started)
+            if status >= 400 or status == 0:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'requests': len(latencies),
+        'errors': errors[0],
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': (percentile(latencies, 50) or 0) * 1000,
+        'p95_ms': (percentile(latencies, 95) or 0) * 1000,
+        'p99_ms': (percentile(latencies, 99) or 0) * 1000,
+    }
+
+
+def start_app(port, formio_url, args):
+    env = dict(
+        os.environ,
+        FORMIO_API_URL=formio_url,
+        FORMIO_API_KEY='bench',
+        FORMIO_API_SECRET='bench',
+        HASHIDS_SALT=os.environ.get('HASHIDS_SALT', 'bench-salt'),
+        HASHIDS_ALPHABET=os.environ.get('HASHIDS_ALPHABET', 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890'),
+        FORMS_BIND=f"127.0.0.1:{port}",
+    )
+    if args.workers:
+        env['FORMS_WORKERS'] = str(args.workers)
+    if args.threads:
+        env['FORMS_THREADS'] = str(args.threads)
+    if args.worker_class:
+        env['FORMS_WORKER_CLASS'] = args.worker_class
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'run:app'],
+        cwd=CLIENT_DIR, env=env
+    )
+
+
+def check_regressions(results, baseline_file, max_regression):
+    with open(baseline_file) as f:
+        baseline = {r['scenario']: r for r in json.load(f)['scenarios']}
+    failures = []
+    for result in results:
+        base = baseline.get(result['scenario'])
+        if not base:
+            continue
+        if base['p95_ms'] and result['p95_ms'] > base['p95_ms'] * (1 + max_regression):
+            failures.append(f"{result['scenario']}: p95 {result['p95_ms']:.1f}ms vs {base['p95_ms']:.1f}ms")
+        if base['throughput'] and result['throughput'] < base['throughput'] * (1 - max_regression):
+            failures.append(f"{result['scenario']}: {result['throughput']:.1f} rps vs {base['throughput']:.1f} rps")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='scenario to run (repeatable)')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent client connections')
+    parser.add_argument('--workers', type=int, help='override FORMS_WORKERS')
+    parser.add_argument('--threads', type=int, help='override FORMS_THREADS')
+    parser.add_argument('--worker-class', help="override FORMS_WORKER_CLASS, e.g. 'sync' to compare")
+    parser.add_argument('--header', action='append', default=[],
+                        help="extra request header, e.g. 'X-Auth-Request-Email: bench@example.org'")
+    parser.add_argument('--app-url', help='benchmark an already running app instead of starting gunicorn')
+    parser.add_argument('--json', dest='json_file', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='allowed relative regression')
+    fake_formio.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    headers = {'X-Auth-Request-Email': 'bench@example.org', 'X-Forwarded-Email': 'bench@example.org'}
+    for header in args.header:
+        key, _, value = header.partition(':')
+        headers[key.strip()] = value.strip()
+
+    formio = fake_formio.from_arguments(args)
+    server, formio_url = fake_formio.serve(formio)
+
+    process = None
+    if args.app_url:
+        port = urlsplit(args.app_url).port
+    else:
+        port = free_port()
+        process = start_app(port, formio_url, args)
+    try:
+        wait_for_port(port)
+        client = Client(port, headers)
+        requests_by_scenario = build_requests(client, list(formio.forms))
+
+        results = []
+        for name in args.scenario or SCENARIOS:
+            # Warm caches and connections before measuring
+            run_scenario(name, requests_by_scenario[name], port, headers, args.concurrency, min(2, args.duration))
+            result = run_scenario(name, requests_by_scenario[name], port, headers, args.concurrency, args.duration)
+            if process is not None:
+                result['worker_rss_mb'] = {pid: rss_mb(pid) for pid in worker_pids(process.pid)}
+            results.append(result)
+            print(f"{name:<18} {result['throughput']:>8.1f} rps  p50 {result['p50_ms']:>7.1f}ms  "
+                  f"p95 {result['p95_ms']:>7.1f}ms  p99 {result['p99_ms']:>7.1f}ms  "
+                  f"errors {result['errors']}  rss {result.get('worker_rss_mb', {})}")
+
+        report = {'scenarios': results, 'upstream_calls': formio.calls}
+        if args.json_file:
+            with open(args.json_file, 'w') as f:
+                json.dump(report, f, indent=2)
+        print(f"upstream calls: {formio.calls}")
+
+        if args.baseline:
+            failures = check_regressions(results, args.baseline, args.max_regression)
+            for failure in failures:
+                print(f"REGRESSION {failure}")
+            return 1 if failures else 0
+        return 0
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# Gunicorn configuration for the Forms module.
+# Used by the Dockerfile and by the benchmark suite (bench/run.py), so both
+# exercise the same server settings. Values can be overridden from the environment,
+# using the same variables (and defaults) as the FORMS_* fields of ModuleSettings in run.py.
+import os
+import sys
+
+bind = os.environ.get('FORMS_BIND', '0.0.0.0:5000')
+
+# Threaded workers: a slow Form.io call blocks one thread, not the whole worker.
+# FormioAPI shares its connection pool, token, caches and breaker between threads.
+worker_class = os.environ.get('FORMS_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('FORMS_WORKERS', 2))
+threads = int(os.environ.get('FORMS_THREADS', 8))
+timeout = int(os.environ.get('FORMS_WORKER_TIMEOUT', 30))
+# Keep browser connections open between page and asset requests
+keepalive = int(os.environ.get('FORMS_KEEPALIVE', 5))
+
+# Load (and warm up) the app once in the master, then fork workers sharing the warmed state.
+# The app gives each forked worker its own connections and background threads.
+preload_app = os.environ.get('FORMS_PRELOAD', '').lower() in ('1', 'true', 'yes')
+
+
+def on_starting(server):
+    """Build fingerprinted, precompressed static assets once, before any worker starts."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.forms.assets import BUILD_DIR, STATIC_DIR, build_if_stale
+    try:
+        built = build_if_stale()
+    except OSError as e:
+        # e.g. a read-only source mount: templates fall back to the unhashed files
+        server.log.warning(f"Forms assets not built: {e}")
+        return
+    if built is not None:
+        server.log.info(f"Built {len(built)} Forms assets into {os.path.join(STATIC_DIR, BUILD_DIR)}")
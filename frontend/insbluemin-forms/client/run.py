@@ -1,10 +1,12 @@
 # from flask import Flask, render_template, render_template_string, jsonify, request, abort, redirect, url_for, g, \
 #     current_app, session
+import logging
+import os
+
 from pocketbase import PocketBase  # Client also works the same
 
 from insbluemin.core import CoreSettings, BlueCore, MenuBuilder, Markdown, app
 from insbluemin.auth import OAuthProxyAuth
-from insbluemin.utils import *
 from insbluemin.core.logger import log
 
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -14,10 +16,77 @@ class ModuleSettings(CoreSettings):
     FORMIO_API_URL: str = ...
     FORMIO_API_KEY: str = ...
     FORMIO_API_SECRET: str = ...
+    FORMIO_TOKEN_REFRESH_MARGIN: int = 300
+
+    # Form.io transport
+    FORMIO_TIMEOUT: float = 5
+    FORMIO_POOL_MAXSIZE: int = 0  # 0: size to FORMS_THREADS + FORMS_BATCH_CONCURRENCY plus background headroom
+    FORMIO_RETRIES: int = 2
+    FORMIO_BACKOFF_FACTOR: float = 0.3
+    FORMIO_BREAKER_THRESHOLD: int = 5
+    FORMIO_BREAKER_RECOVERY: int = 30
+
+    # Gunicorn concurrency (read from the same environment variables by gunicorn.conf.py).
+    # gthread workers overlap upstream waits: each thread blocks on Form.io on its own.
+    FORMS_WORKER_CLASS: str = 'gthread'
+    FORMS_WORKERS: int = 2
+    FORMS_THREADS: int = 8  # request threads per worker
+    FORMS_WORKER_TIMEOUT: int = 30
+    # Load the app once in the gunicorn master and fork warmed workers from it (gunicorn --preload)
+    FORMS_PRELOAD: bool = False
+
+    # Startup warm-up: 'sync' (before accepting requests), 'background' (/ready answers 503 until warm) or 'off'
+    FORMS_WARMUP: str = 'sync'
+    FORMS_WARMUP_TIMEOUT: float = 10  # keep below FORMS_WORKER_TIMEOUT
+    FORMS_WARMUP_SCHEMAS: int = 20  # most recently modified forms primed
+    FORMS_WARMUP_FORMS: str = ''  # comma-separated form paths always primed
+
+    # Instrumentation
+    FORMS_METRICS_TOKEN: str = ''  # bearer token for /metrics; empty disables the endpoint
+    FORMS_SLOW_REQUEST_SECONDS: float = 0  # 0 disables the slow-request log
 
     HASHIDS_SALT: str = ...
     HASHIDS_ALPHABET: str = ...
 
+    # Submission id codec: 'hashids' or 'keyed' (old hashids URLs keep working either way)
+    FORMS_ID_CODEC: str = 'hashids'
+    FORMS_ID_CODEC_KEY: str = ''
+    FORMS_ID_CACHE_SIZE: int = 4096
+
+    # Form schema cache
+    FORMS_SCHEMA_CACHE_SIZE: int = 128
+    FORMS_SCHEMA_CACHE_TTL: int = 300
+    FORMS_SCHEMA_CACHE_STALE_TTL: int = 3600
+    # Comma-separated component keys never sent to the browser, at any depth (filled in server-side)
+    FORMS_INTERNAL_FIELDS: str = 'auth_user_email'
+
+    # Form catalog (index page)
+    FORMS_CATALOG_TTL: int = 60
+
+    # Submission listings
+    FORMS_PAGE_SIZE: int = 50
+    FORMS_MAX_PAGE_SIZE: int = 500
+    FORMS_EXPORT_PAGE_SIZE: int = 500
+    FORMS_SUBMISSIONS_VIEW: str = 'table'  # 'table' (server-rendered pages) or 'virtual' (columnar JSON, virtual scrolling)
+
+    # Batch endpoint (POST /batch): items fetched concurrently per worker, and items allowed per request
+    FORMS_BATCH_CONCURRENCY: int = 8
+    FORMS_BATCH_MAX_ITEMS: int = 50
+
+    # JSON responses at least this large are gzip/brotli compressed
+    FORMS_COMPRESS_MIN_SIZE: int = 1024
+
+    # Submissions: 'sync' proxies to Form.io, 'spool' accepts into a local queue and delivers in the background
+    FORMS_SUBMIT_MODE: str = 'sync'
+    FORMS_SPOOL_PATH: str = ''  # defaults to <instance path>/forms-spool.sqlite3
+    FORMS_SPOOL_MAX_ATTEMPTS: int = 10
+    FORMS_SPOOL_RETENTION: int = 86400
+    FORMS_IDEMPOTENCY_CACHE_SIZE: int = 1024
+
+    # State shared between gunicorn workers: 'memory' (per process), 'sqlite' (one host) or 'redis'
+    FORMS_SHARED_STATE: str = 'memory'
+    FORMS_SHARED_STATE_URL: str = ''  # SQLite file (default instance/forms-state.sqlite3) or redis:// URL
+
 
 app.config['APP_DIR'] = os.path.dirname(__file__)
 app.config['APPLICATION_ROOT'] = '/forms/'  # this needs to be commented out for localhost development else the login loops
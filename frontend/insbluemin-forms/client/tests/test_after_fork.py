@@ -0,0 +1,81 @@
+import os
+import signal
+import threading
+
+import pytest
+
+pytest.importorskip('requests')
+
+from app.forms.codec import build_codec  # noqa: E402
+from app.forms.permissions import PermissionEngine  # noqa: E402
+from app.forms.spool import IdempotencyCache  # noqa: E402
+from app.forms.transport import CircuitBreaker  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+
+
+def run_forked_while_held(lock, child):
+    """
+    Fork while another thread holds ``lock`` and run ``child`` in the forked process.
+
+    :return: the child's exit status (0 on success, 1 on error, 2 if it hung)
+    """
+    acquired, release = threading.Event(), threading.Event()
+
+    def hold():
+        with lock:
+            acquired.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold, daemon=True)
+    holder.start()
+    acquired.wait()
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGALRM, lambda *args: os._exit(2))
+        signal.alarm(5)
+        try:
+            child()
+        except BaseException:
+            os._exit(1)
+        os._exit(0)
+    release.set()
+    holder.join()
+    return os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+
+def test_breaker_usable_after_fork_while_its_lock_is_held():
+    breaker = CircuitBreaker()
+
+    def child():
+        breaker.after_fork()
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert run_forked_while_held(breaker._lock, child) == 0
+
+
+def test_permission_caches_usable_after_fork_while_a_lock_is_held():
+    engine = PermissionEngine()
+
+    def child():
+        engine.after_fork()
+        assert engine.check(['forms.can_read'], {'tags': []})
+        engine.stats()
+
+    assert run_forked_while_held(engine._decisions._lock, child) == 0
+
+
+def test_codec_and_idempotency_usable_after_fork_while_a_lock_is_held():
+    codec = build_codec({'HASHIDS_SALT': 'salt'})
+    idempotency = IdempotencyCache()
+    object_id = '0123456789abcdef01234567'
+
+    def child():
+        codec.after_fork()
+        idempotency.after_fork()
+        assert codec.decode(codec.encode(object_id)) == object_id
+        assert idempotency.begin('key') == (True, None)
+
+    assert run_forked_while_held(codec._encoded._lock, child) == 0
+    assert run_forked_while_held(idempotency._lock, child) == 0
@@ -0,0 +1,32 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip('flask')
+
+from app.forms.assets import BUILD_DIR, MANIFEST, build_if_stale  # noqa: E402
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_build_if_stale_builds_missing_manifest_and_changed_sources(tmp_path):
+    source = tmp_path / 'dist' / 'css' / 'forms.css'
+    write(str(source), 'body { color: red }')
+
+    built = build_if_stale(str(tmp_path))
+    assert built['dist/css/forms.css'].startswith(f"{BUILD_DIR}/dist/css/forms.")
+    with open(tmp_path / BUILD_DIR / MANIFEST) as f:
+        assert json.load(f) == built
+
+    # Up to date: nothing to do
+    assert build_if_stale(str(tmp_path)) is None
+
+    # A source newer than the manifest triggers a rebuild
+    manifest_mtime = os.path.getmtime(tmp_path / BUILD_DIR / MANIFEST)
+    os.utime(source, (manifest_mtime + 10, manifest_mtime + 10))
+    assert build_if_stale(str(tmp_path)) is not None
@@ -0,0 +1,40 @@
+import os
+import re
+from datetime import datetime, timezone
+
+from jinja2 import Environment, FileSystemLoader
+
+from app.forms.export import columnar, table_columns
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), '..', 'app', 'forms', 'templates')
+
+
+def submission(obfuscated_id, **data):
+    return {'obfuscated_id': obfuscated_id, 'created': datetime(2024, 3, 1, tzinfo=timezone.utc), 'data': data}
+
+
+def test_table_columns_follow_the_schema_whatever_the_rows():
+    subs = [submission('a', extra=1, name='x', submit=True)]
+    assert table_columns(subs, ['name', 'amount', 'submit']) == ['name', 'amount']
+    assert table_columns([], ['name', 'amount']) == ['name', 'amount']
+
+
+def test_table_columns_fall_back_to_row_keys_without_schema():
+    subs = [submission('a', name='x', auth_user_email='u@example.com', submit=True), submission('b', amount=2)]
+    assert table_columns(subs, []) == ['name', 'amount']
+
+
+def test_columnar_keeps_keys_missing_from_the_schema():
+    payload = columnar([submission('a', name='x', extra=1)], ['name'])
+    assert payload['columns'] == ['obfuscated_id', 'created', 'name', 'extra']
+    assert payload['rows'][0][2:] == ['x', 1]
+
+
+def test_row_cells_line_up_with_the_columns():
+    env = Environment(loader=FileSystemLoader(TEMPLATES))
+    subs = [submission('a', amount=3, name='first'), submission('b', other='dropped')]
+    html = env.get_template('forms-submission-rows.jinja2').render(submissions=subs, columns=['name', 'amount'])
+    rows = [re.findall(r'<td[^>]*>\s*(.*?)\s*</td>', row, re.S) for row in html.split('<tr')[1:]]
+    # created, the header columns in order, then the edit link
+    assert [cells[1:3] for cells in rows] == [['first', '3'], ['', '']]
+    assert all(len(cells) == 4 for cells in rows)
@@ -0,0 +1,35 @@
+import http.client
+import json
+
+from bench.fake_formio import FakeFormio, serve
+
+
+def test_login_then_get_over_one_keepalive_connection():
+    server, base_url = serve(FakeFormio(forms=2, components=2, rows=3, latency=0, jitter=0))
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        conn.request('POST', '/machine/login', body=json.dumps({'data': {'api_key': 'k', 'api_secret': 's'}}),
+                     headers={'Content-Type': 'application/json'})
+        login = conn.getresponse()
+        login.read()
+        assert login.status == 200
+        token = login.getheader('X-Jwt-Token')
+
+        # Same connection: the login body must not leak into this request
+        conn.request('GET', '/form?select=title,path&limit=10', headers={'X-Jwt-Token': token})
+        forms = conn.getresponse()
+        assert forms.status == 200
+        assert len(json.loads(forms.read())) == 2
+
+        # An unauthorized POST is answered without reading its body, which must still be drained
+        conn.request('POST', '/form', body=json.dumps({'data': {}}), headers={'Content-Type': 'application/json'})
+        denied = conn.getresponse()
+        denied.read()
+        assert denied.status == 401
+        conn.request('GET', '/form', headers={'X-Jwt-Token': token})
+        again = conn.getresponse()
+        again.read()
+        assert again.status == 200
+        conn.close()
+    finally:
+        server.shutdown()
@@ -0,0 +1,53 @@
+import re
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from app.forms.filters import contains_pattern, parse_date_bound, submission_query
+
+
+def literal(pattern):
+    """Split a '/pattern/flags' literal the way Form.io does, at the last unescaped '/'."""
+    match = re.fullmatch(r'/((?:\\.|[^\\/])*)/([a-z]*)', pattern)
+    assert match, f"not a single regex literal: {pattern}"
+    return re.compile(match.group(1), re.IGNORECASE if 'i' in match.group(2) else 0)
+
+
+@pytest.mark.parametrize('text', ['12/05', 'a/b', 'foo.bar', '(x)*', 'back\\slash'])
+def test_contains_pattern_matches_text_literally(text):
+    regex = literal(contains_pattern(text))
+    assert regex.search(f"before {text.upper()} after")
+    assert not regex.search('unrelated')
+
+
+def test_contains_pattern_escapes_delimiter():
+    assert contains_pattern('12/05') == r'/12\/05/i'
+
+
+def test_parse_date_bound_bare_date():
+    assert parse_date_bound('2024-03-01') == '2024-03-01T00:00:00.000Z'
+    # An end date includes the whole day
+    assert parse_date_bound('2024-03-01', end=True) == '2024-03-02T00:00:00.000Z'
+
+
+def test_parse_date_bound_timestamp_to_utc():
+    assert parse_date_bound('2024-03-01T10:30:00Z') == '2024-03-01T10:30:00.000Z'
+    assert parse_date_bound('2024-03-01T10:30:00+02:00') == '2024-03-01T08:30:00.000Z'
+    assert parse_date_bound('2024-03-01T10:30:00', end=True) == '2024-03-01T10:30:00.000Z'
+
+
+def test_parse_date_bound_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_date_bound('yesterday')
+
+
+def test_submission_query():
+    args = MultiDict({'q': 'a/b', 'f.status': 'open', 'f.amount__gte': '10', 'to': '2024-03-01'})
+    assert submission_query(args, ['name', 'status', 'amount']) == {
+        'data.name__regex': r'/a\/b/i',
+        'data.status': 'open',
+        'data.amount__gte': '10',
+        'created__lt': '2024-03-02T00:00:00.000Z',
+    }
+    with pytest.raises(ValueError):
+        submission_query(MultiDict({'f.secret': 'x'}), ['name'])
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('markupsafe')
+
+from app.forms.schema import slim_components  # noqa: E402
+
+
+def test_table_view_is_kept_inside_editgrid():
+    components = [{
+        'type': 'editgrid',
+        'key': 'items',
+        'tableView': True,
+        'components': [
+            {'type': 'textfield', 'key': 'name', 'tableView': True},
+            {'type': 'textfield', 'key': 'notes', 'tableView': False, 'placeholder': ''},
+        ],
+    }]
+
+    slim = slim_components(components)
+
+    grid = slim[0]
+    assert grid['tableView'] is True
+    assert [c['key'] for c in grid['components']] == ['name', 'notes']
+    assert grid['components'][1]['tableView'] is False
+    # Default-valued properties are still dropped
+    assert 'placeholder' not in grid['components'][1]
+
+
+def test_internal_fields_removed_at_any_depth():
+    components = [{
+        'type': 'editgrid',
+        'key': 'items',
+        'components': [{'type': 'email', 'key': 'auth_user_email'}, {'type': 'textfield', 'key': 'name'}],
+    }]
+
+    assert [c['key'] for c in slim_components(components)[0]['components']] == ['name']
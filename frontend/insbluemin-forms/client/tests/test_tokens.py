@@ -0,0 +1,41 @@
+import time
+
+from app.forms.shared import SQLiteStore
+from app.forms.tokens import TOKEN_KEY, TokenManager
+
+
+def short_lived(calls, ttl=20):
+    def login():
+        calls.append(time.time())
+        return f'token-{len(calls)}', time.time() + ttl
+    return login
+
+
+def test_token_shorter_than_refresh_margin_is_not_renewed_in_a_loop():
+    calls = []
+    tokens = TokenManager(short_lived(calls), refresh_margin=300)
+    assert tokens.get() == 'token-1'
+    time.sleep(1)
+    # The margin is capped at half the 20s lifetime: no renewal yet
+    assert len(calls) == 1
+
+
+def test_renewals_are_min_backoff_apart():
+    calls = []
+    tokens = TokenManager(short_lived(calls, ttl=6), refresh_margin=300, min_backoff=0.5)
+    tokens.get()
+    time.sleep(1.5)
+    # Renewed every 3s at most, and never sooner than min_backoff
+    assert len(calls) <= 2
+
+
+def test_short_lived_shared_token_is_adopted(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'shared.sqlite'))
+    first = TokenManager(short_lived([]), refresh_margin=300, store=store)
+    assert first.get() == 'token-1'
+    assert store.get(TOKEN_KEY)['token'] == 'token-1'
+
+    calls = []
+    second = TokenManager(short_lived(calls), refresh_margin=300, store=store)
+    assert second.get() == 'token-1'
+    assert second.adopted == 1 and not calls
@@ -0,0 +1,87 @@
+import inspect
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from flask import Flask
+from werkzeug.exceptions import HTTPException
+
+pytest.importorskip('insbluemin')
+
+from app.forms import views  # noqa: E402
+
+
+@pytest.fixture
+def view():
+    app = Flask(__name__)
+    view = views.FormsView.__new__(views.FormsView)
+    view.app = app
+    view.formio = SimpleNamespace(
+        get_form=lambda path: SimpleNamespace(data={'path': path, 'tags': ['restricted'], 'components': []}),
+        permissions=SimpleNamespace(check=lambda permissions, form: 'restricted' in permissions),
+        get_page=mock.Mock(side_effect=AssertionError("rows fetched without the permission")),
+    )
+    user = SimpleNamespace(email='user@example.com', permissions=['forms.can_read'])
+    with app.app_context(), mock.patch.object(views, 'current_user', user):
+        yield view
+
+
+@pytest.mark.parametrize('args', ['form=columns', 'form=json', 'form=rows', 'view=table', 'view=virtual'])
+def test_form_submissions_checks_form_permission_in_every_mode(view, args):
+    form_submissions = inspect.unwrap(views.FormsView.form_submissions)
+    with view.app.test_request_context(f'/view/restricted/submission?{args}'):
+        response, status = form_submissions(view, 'restricted')
+    assert status == 403
+    view.formio.get_page.assert_not_called()
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.text = body if isinstance(body, str) else json.dumps(body)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def test_validation_details_keeps_only_messages_and_paths():
+    resp = FakeResponse(400, {
+        'name': 'ValidationError',
+        'details': [{'message': 'Name is required', 'path': ['name'], 'context': {'validator': 'required'}}],
+        'stack': '/srv/formio/src/resources/Validator.js:42',
+    })
+    assert views.validation_details(resp) == [{'message': 'Name is required', 'path': ['name']}]
+    assert views.validation_details(FakeResponse(400, 'Bad request')) == []
+
+
+def test_fetch_does_not_forward_upstream_error_body():
+    api = views.FormioAPI.__new__(views.FormioAPI)
+    api.api_url = 'http://formio'
+    api._build_headers = lambda: {}
+    api._send = lambda *args, **kwargs: FakeResponse(500, 'token=secret at /srv/formio/index.js')
+    with Flask(__name__).app_context(), pytest.raises(HTTPException) as error:
+        api._fetch('form/x')
+    assert error.value.code == 502
+    assert 'secret' not in error.value.description
+
+
+@pytest.mark.parametrize('configured, header, status', [
+    ('', 'Bearer ', 404),
+    ('s3cret', None, 401),
+    ('s3cret', 'Bearer wrong', 401),
+    ('s3cret', 'Bearer s3cret', 200),
+])
+def test_metrics_require_the_token(configured, header, status):
+    app = Flask(__name__)
+    app.config['FORMS_METRICS_TOKEN'] = configured
+    metrics = views.MetricsView.__new__(views.MetricsView)
+    metrics.app = app
+    headers = {'Authorization': header} if header is not None else {}
+    with app.test_request_context('/metrics', headers=headers):
+        if status == 200:
+            assert metrics.metrics().status_code == 200
+        else:
+            with pytest.raises(HTTPException) as error:
+                metrics.metrics()
+            assert error.value.code == status